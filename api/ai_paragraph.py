@@ -0,0 +1,138 @@
+import os, time, threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from deck_inputs import DEFAULT_YEARS, HISTORY_START, period
+
+# ---------- AI PARAGRAPH ----------
+# The slide 34 narrative is requested as soon as the headline numbers are known and runs
+# on a small thread pool while the rest of the deck is built. The caller waits at most
+# AI_DEADLINE_S (counted from the request) and otherwise uses the fallback paragraph;
+# a late answer still lands in the cache for the next request with the same numbers.
+#
+# Providers: AI_PROVIDER=gemini (default) | stub (offline, for load tests) | off
+
+AI_PROVIDER      = os.environ.get("AI_PROVIDER", "gemini").lower()
+AI_DEADLINE_S    = float(os.environ.get("AI_DEADLINE_S", "10"))
+AI_WORKERS       = int(os.environ.get("AI_WORKERS", "8"))
+AI_CACHE_ENTRIES = int(os.environ.get("AI_CACHE_ENTRIES", "256"))
+AI_STUB_DELAY_S  = float(os.environ.get("AI_STUB_DELAY_S", "0"))
+
+def build_prompt(market_name, value_base, cagr_history, years=DEFAULT_YEARS):
+    base, forecast = years
+    return (
+        f"Write a professional market analysis paragraph for {market_name}. "
+        f"It reached US$ {value_base:,.0f} Million in {base} with a CAGR of {cagr_history}% "
+        f"during {period(HISTORY_START, base)}. Highlight key growth drivers, emerging trends, "
+        f"and the {period(base + 1, forecast)} outlook in 2–3 sentences. Keep it objective and concise."
+    )
+
+# ---------- PROVIDERS ----------
+# A provider only needs generate(market_name, value_base, cagr_history, years) -> str or None,
+# and `available`: an unconfigured provider is treated like "off" (no request, no fallback).
+
+class GeminiProvider:
+    name = "gemini"
+
+    def __init__(self, model="models/gemini-1.5-flash"):
+        self.model = model
+        self.api_key = os.environ.get("GEMINI_API_KEY")   # unset: provider unavailable
+
+    @property
+    def available(self): return bool(self.api_key)
+
+    def generate(self, market_name, value_base, cagr_history, years=DEFAULT_YEARS):
+        if not self.api_key: return None
+        import google.generativeai as genai   # imported lazily: only needed when the provider is used
+        genai.configure(api_key=self.api_key)
+        prompt = build_prompt(market_name, value_base, cagr_history, years)
+        return genai.GenerativeModel(self.model).generate_content(prompt).text.strip()
+
+class StubProvider:
+    # deterministic, network-free paragraph; `delay` simulates model latency
+    name = "stub"
+    available = True
+
+    def __init__(self, delay=AI_STUB_DELAY_S):
+        self.delay = delay
+
+    def generate(self, market_name, value_base, cagr_history, years=DEFAULT_YEARS):
+        if self.delay: time.sleep(self.delay)
+        base, forecast = years
+        return (
+            f"The {market_name} market stood at US$ {value_base:,.0f} Million in {base}, "
+            f"having grown at {cagr_history}% a year during {period(HISTORY_START, base)}. "
+            f"Growth through {forecast} is expected to track product innovation and wider adoption."
+        )
+
+class NoProvider:
+    name = "off"
+    available = False
+    def generate(self, market_name, value_base, cagr_history, years=DEFAULT_YEARS): return None
+
+PROVIDERS = {"gemini": GeminiProvider, "stub": StubProvider, "off": NoProvider}
+
+def make_provider(name=AI_PROVIDER): return PROVIDERS.get(name, NoProvider)()
+
+# ---------- CACHE / SCHEDULING ----------
+
+class ParagraphService:
+    def __init__(self, provider=None, deadline_s=AI_DEADLINE_S, workers=AI_WORKERS, max_entries=AI_CACHE_ENTRIES):
+        self.provider    = provider or make_provider()
+        self.deadline_s  = deadline_s
+        self.max_entries = max_entries
+        self._pool  = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ai-paragraph")
+        self._cache = OrderedDict()   # key -> Future (in flight or resolved with a paragraph)
+        self._lock  = threading.Lock()
+        self.hits = self.misses = self.timeouts = 0
+
+    @staticmethod
+    def key(market_name, value_base, cagr_history, years):
+        return (str(market_name), round(float(value_base), 6), str(cagr_history), tuple(years))
+
+    def _call(self, args):
+        try:
+            return self.provider.generate(*args) or None
+        except Exception:
+            return None
+
+    def _forget_failure(self, key, fut):
+        # don't cache failures; the next request retries
+        if fut.result() is None:
+            with self._lock:
+                if self._cache.get(key) is fut: del self._cache[key]
+
+    def request(self, market_name, value_base, cagr_history, years=DEFAULT_YEARS):
+        # returns a ticket for result() (None when the provider is unavailable);
+        # identical in-flight requests share one provider call
+        if not self.provider.available: return None
+        args = (market_name, value_base, cagr_history, years)
+        key = self.key(*args)
+        with self._lock:
+            fut = self._cache.get(key)
+            if fut is not None:
+                self._cache.move_to_end(key); self.hits += 1
+                return fut, time.monotonic() + self.deadline_s
+            self.misses += 1
+            fut = self._pool.submit(self._call, args)
+            self._cache[key] = fut
+            while len(self._cache) > self.max_entries: self._cache.popitem(last=False)
+        fut.add_done_callback(lambda f: self._forget_failure(key, f))
+        return fut, time.monotonic() + self.deadline_s
+
+    def result(self, ticket, deadline=None):
+        fut, ai_deadline = ticket
+        wait = ai_deadline if deadline is None else min(ai_deadline, deadline)
+        try:
+            return fut.result(timeout=max(0.0, wait - time.monotonic()))
+        except FutureTimeout:
+            with self._lock: self.timeouts += 1
+            return None
+        except Exception:
+            return None
+
+    def stats(self):
+        return {"provider": self.provider.name, "available": self.provider.available, "entries": len(self._cache),
+                "hits": self.hits, "misses": self.misses, "timeouts": self.timeouts}
+
+paragraph_service = ParagraphService()
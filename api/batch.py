@@ -0,0 +1,183 @@
+import io, os, sys, json, time, zipfile, argparse, threading, traceback, multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from generate_poc import generate_deck
+from template_cache import open_template
+from memstat import mb
+
+# ---------- BATCH GENERATION ----------
+# Many workbooks + one shared template -> one zip of decks. Generation fans out over a
+# process pool; each worker receives the template bytes once (initializer) and parses
+# them into its template cache, so every workbook after the first is a cache hit.
+# Workers come from a forkserver that has the engine imported: they start warm, but are
+# not forked from the (threaded) server, whose AI pool and cache locks would not survive it.
+# A failing workbook is recorded in batch_report.json instead of aborting the batch.
+#
+# Memory and processes are bounded: workbooks are read from the archive only as workers
+# free up (at most two per worker in flight), an entry over the size limit is reported
+# without being decompressed, and the server runs at most BATCH_CONCURRENCY batches at a
+# time with BATCH_WORKERS processes each (see acquire_batch_slot).
+
+EXCEL_EXTS        = (".xlsx", ".xls")
+BATCH_TIMEOUT_S   = 120        # per workbook
+BATCH_REPORT      = "batch_report.json"
+BATCH_WORKERS     = int(os.environ.get("BATCH_WORKERS", str(os.cpu_count() or 1)))
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "1"))
+
+_batch_slots = threading.BoundedSemaphore(BATCH_CONCURRENCY)
+
+def acquire_batch_slot(): return _batch_slots.acquire(blocking=False)
+def release_batch_slot(): _batch_slots.release()
+
+class EntryTooLarge(ValueError):
+    pass
+
+_worker_template = None
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    if "forkserver" not in methods: return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["generate_poc"])
+    return ctx
+
+def _init_worker(template_bytes):
+    global _worker_template
+    _worker_template = template_bytes
+    open_template(template_bytes)   # parse once per worker; later calls clone from the cache
+
+def _generate_one(name, excel_bytes, use_ai):
+    t0 = time.perf_counter()
+    try:
+        deck = generate_deck(excel_bytes, _worker_template, use_ai=use_ai,
+                             deadline=time.monotonic() + BATCH_TIMEOUT_S)
+        return name, deck, None, time.perf_counter() - t0
+    except Exception:
+        return name, None, traceback.format_exc(limit=3), time.perf_counter() - t0
+
+def is_workbook_name(name):
+    base = os.path.basename(name)
+    return base.lower().endswith(EXCEL_EXTS) and not base.startswith(("~$", "."))
+
+def _read_entry(zf, info, max_bytes):
+    # the header size is checked first; the read is capped too, in case the header lies
+    if max_bytes is None: return zf.read(info)
+    too_large = EntryTooLarge(f"{info.filename}: over the {mb(max_bytes)} MB workbook limit")
+    if info.file_size > max_bytes: return too_large
+    with zf.open(info) as f: data = f.read(max_bytes + 1)
+    return too_large if len(data) > max_bytes else data
+
+def iter_workbooks(src, max_bytes=None):
+    # src: directory path, zip path, zip bytes or zip file object -> (name, bytes), read as
+    # consumed; an entry over max_bytes comes back as (name, EntryTooLarge) without its data
+    if isinstance(src, (str, os.PathLike)) and os.path.isdir(src):
+        for name in sorted(os.listdir(src)):
+            path = os.path.join(src, name)
+            if os.path.isfile(path) and is_workbook_name(name):
+                with open(path, "rb") as f: yield name, f.read()
+        return
+    if isinstance(src, (bytes, bytearray)): src = io.BytesIO(src)
+    with zipfile.ZipFile(src) as zf:
+        for info in zf.infolist():
+            if not info.is_dir() and "__MACOSX" not in info.filename and is_workbook_name(info.filename):
+                yield info.filename, _read_entry(zf, info, max_bytes)
+
+def deck_name(workbook_name, taken):
+    return unique_deck_name(os.path.splitext(os.path.basename(workbook_name))[0], taken)
+
+def unique_deck_name(stem, taken):
+    stem = stem or "deck"
+    name, n = f"{stem}.pptx", 1
+    while name in taken:
+        n += 1; name = f"{stem}_{n}.pptx"
+    taken.add(name)
+    return name
+
+class _ChunkSink:
+    # write-only, unseekable file object; zipfile then streams entries with data descriptors
+    def __init__(self): self._chunks = []; self._pos = 0
+    def write(self, b): self._chunks.append(bytes(b)); self._pos += len(b); return len(b)
+    def tell(self): return self._pos
+    def flush(self): pass
+    def drain(self):
+        out = b"".join(self._chunks); self._chunks = []
+        return out
+
+def stream_batch_zip(workbooks, template, use_ai=True, workers=None):
+    # yields the output zip in chunks as decks complete
+    return stream_decks_zip(workbooks, template, _generate_one, deck_name, "workbook", use_ai, workers)
+
+# items: (name, payload), consumed lazily; task(name, payload, use_ai) runs in a worker ->
+# (name, deck, error, seconds). A payload that is an exception is reported as that item's error.
+def stream_decks_zip(items, template, task, name_for, label, use_ai=True, workers=None):
+    items = iter(items)
+    if isinstance(template, (str, os.PathLike)):
+        with open(template, "rb") as f: template = f.read()
+    workers = max(1, workers or BATCH_WORKERS)   # processes start on demand, so a small batch uses fewer
+
+    sink = _ChunkSink()
+    report, taken = [], set()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                               initializer=_init_worker, initargs=(template,))
+
+    def record(name, deck, error, seconds):
+        entry = {label: name, "seconds": round(seconds, 3)}
+        if error is None:
+            entry["deck"] = name_for(name, taken)
+            zf.writestr(entry["deck"], deck)
+        else:
+            entry["error"] = error
+        report.append(entry)
+
+    try:
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            pending, exhausted = set(), False
+            while True:
+                while not exhausted and len(pending) < 2 * workers:
+                    item = next(items, None)
+                    if item is None: exhausted = True; break
+                    name, payload = item
+                    if isinstance(payload, Exception): record(name, None, str(payload), 0.0)
+                    else: pending.add(pool.submit(task, name, payload, use_ai))
+                if not pending: break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done: record(*fut.result())
+                chunk = sink.drain()
+                if chunk: yield chunk
+            report.sort(key=lambda e: e[label])
+            zf.writestr(BATCH_REPORT, json.dumps({
+                "ok": sum(1 for e in report if "deck" in e),
+                "failed": sum(1 for e in report if "error" in e),
+                "files": report,
+            }, indent=2))
+        yield sink.drain()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def generate_batch(src, template, out, use_ai=True, workers=None):
+    with open(out, "wb") as f:
+        for chunk in stream_batch_zip(iter_workbooks(src), template, use_ai=use_ai, workers=workers):
+            f.write(chunk)
+
+# ---------- CLI ----------
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate one deck per workbook in a zip or directory.")
+    ap.add_argument("source", help="zip file or directory of .xlsx workbooks")
+    ap.add_argument("-t", "--template", default=os.path.join(os.path.dirname(__file__), "default_template.pptx"))
+    ap.add_argument("-o", "--out", default="decks.zip")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: BATCH_WORKERS or CPU count)")
+    ap.add_argument("--no-ai", action="store_true", help="use the fallback paragraph instead of the AI call")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    generate_batch(args.source, args.template, args.out, use_ai=not args.no_ai, workers=args.workers)
+    with zipfile.ZipFile(args.out) as zf:
+        summary = json.loads(zf.read(BATCH_REPORT))
+    print(f"Batch done in {time.perf_counter() - t0:.1f}s: {summary['ok']} decks, "
+          f"{summary['failed']} failed -> {args.out}")
+    for e in summary["files"]:
+        if "error" in e: print(f"  FAILED {e['workbook']}: {e['error'].strip().splitlines()[-1]}")
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
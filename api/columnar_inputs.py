@@ -0,0 +1,150 @@
+import io, csv, json, time, zipfile
+from contextlib import contextmanager
+from functools import partial
+from deck_inputs import (BASE_YEAR, FORECAST_YEAR, BREAKUP_BANDS, SUMMARY_VALUE,
+                         YEAR_COL, SALES_COL, cagr_col, headline_from, series_rows, assemble)
+from workbook import workbook_sheets, BREAKUP_PREFIX
+from lean_reader import NAN, infer_column, column_names, value_table_rows
+from timing import timed
+
+# ---------- COLUMNAR INPUTS ----------
+# The workbook's logical tables without the spreadsheet, for pipelines that already hold
+# them as dataframes. Tables are named after the sheets they replace:
+#   Summary         field labels in the first column, values in "Value" (JSON: {field: value})
+#   Sales_Forecast  the Year / Sales Value (Million USD) / CAGR <2019–base year> (%) columns
+#   By_*            the sales value table: label column, then year columns ("2024", "2033", ...)
+# Sent as one JSON document {"Summary": ..., "Sales_Forecast": ..., "By_Type": ...}, tables
+# as {column: [values]} or [{column: value}, ...], or as a zip bundle with one file per
+# table: <name>.csv, .parquet or .arrow/.feather (the last two need the optional pyarrow,
+# imported on use; see requirements-optional.txt).
+# Columns get the read_csv-style type inference of lean_reader.infer_column, so a bundle
+# exported from the workbook's frames parses to exactly the data the xlsx path produces.
+# Same reader interface as frame_parser / lean_reader: iter_sheets, headline, parse_inputs.
+
+TABLE_EXTENSIONS = (".csv", ".parquet", ".arrow", ".feather")
+ZIP_MAGIC = b"PK\x03\x04"
+
+def _peek(src, n):
+    if isinstance(src, str):
+        with open(src, "rb") as f: return f.read(n)
+    pos = src.tell(); src.seek(0)
+    try: return src.read(n)
+    finally: src.seek(pos)
+
+def input_kind(src):
+    # "json", "bundle", or None for a workbook (xlsx package, legacy xls)
+    head = _peek(src, 64)
+    if head.lstrip(b"\xef\xbb\xbf \t\r\n")[:1] == b"{": return "json"
+    if head[:4] != ZIP_MAGIC: return None
+    pos = None if isinstance(src, str) else src.tell()
+    try:
+        with zipfile.ZipFile(src) as z: is_xlsx = "xl/workbook.xml" in z.NameToInfo
+    except zipfile.BadZipFile:
+        is_xlsx = True   # left to the workbook reader to report
+    finally:
+        if pos is not None: src.seek(pos)
+    return None if is_xlsx else "bundle"
+
+def _columns(names, columns):
+    # nulls -> NaN, then per-column type inference; blank/repeated names as pandas names them
+    return dict(zip(column_names(names), (infer_column([NAN if v is None else v for v in col]) for col in columns)))
+
+def csv_table(f):
+    rows = list(csv.reader(io.TextIOWrapper(f, encoding="utf-8-sig", newline="")))
+    if not rows: return {}
+    width = max(len(r) for r in rows)
+    rows = [r + [""] * (width - len(r)) for r in rows]
+    return _columns(rows[0], zip(*rows[1:]) if len(rows) > 1 else [[] for _ in rows[0]])
+
+def arrow_table(f, ext):
+    try:
+        import pyarrow.parquet as pq, pyarrow.feather as feather
+    except ImportError:
+        raise ValueError(f"{ext} tables need pyarrow installed") from None
+    table = (pq.read_table if ext == ".parquet" else feather.read_table)(f).to_pydict()
+    return _columns(list(table), table.values())
+
+def json_table(value):
+    if isinstance(value, dict) and not any(isinstance(v, list) for v in value.values()):
+        return value   # a {field: value} Summary
+    if isinstance(value, list):   # records
+        names = list(dict.fromkeys(k for record in value for k in record))
+        return _columns(names, [[record.get(k) for record in value] for k in names])
+    return _columns(list(value), value.values())
+
+def summary_fields(table):
+    # {field: value}: a JSON mapping as is, a table as first column -> "Value" column
+    if table and not any(isinstance(v, list) for v in table.values()): return table
+    labels, values = next(iter(table.values()), []), table.get(SUMMARY_VALUE, [])
+    fields = {}
+    for label, value in zip(labels, values): fields.setdefault(label, value)
+    return fields
+
+def _load(name, read):
+    table = read()
+    return summary_fields(table) if name == "Summary" else table
+
+def _member(z, info, ext):
+    with z.open(info) as f:
+        if ext == ".csv": return csv_table(f)
+        return arrow_table(io.BytesIO(f.read()), ext)
+
+@contextmanager
+def open_tables(src):
+    # -> {table name: loader}, in document / bundle order; loaders parse on call.
+    # A file object is read from the start and left where it was.
+    pos = None if isinstance(src, str) else src.tell()
+    try:
+        if input_kind(src) == "json":
+            if isinstance(src, str):
+                with open(src, "rb") as f: doc = json.load(f)
+            else:
+                src.seek(0); doc = json.load(src)
+            if not isinstance(doc, dict): raise ValueError("JSON inputs must be an object of tables")
+            yield {name: partial(_load, name, partial(json_table, value)) for name, value in doc.items()}
+            return
+        with zipfile.ZipFile(src) as z:
+            tables = {}
+            for info in z.infolist():
+                stem, dot, ext = info.filename.rpartition("/")[2].rpartition(".")
+                if dot and "." + ext.lower() in TABLE_EXTENSIONS and stem not in tables:
+                    tables[stem] = partial(_load, stem, partial(_member, z, info, "." + ext.lower()))
+            yield tables
+    finally:
+        if pos is not None: src.seek(pos)
+
+def iter_sheets(src, sheets=None):
+    # same contract as workbook.iter_sheets; sheets=None reads Summary, Sales_Forecast and every By_* table
+    t0 = time.perf_counter()
+    with open_tables(src) as tables:
+        yield "<open>", None, time.perf_counter() - t0
+        for name in sheets or workbook_sheets(list(tables)):
+            if name not in tables: raise ValueError(f"Table '{name}' not found")
+            t0 = time.perf_counter()
+            table = tables[name]()
+            yield name, table, time.perf_counter() - t0
+
+# ---------- LOAD ----------
+
+def forecast_columns(forecast, years=None):
+    return forecast[YEAR_COL], forecast[SALES_COL], forecast[cagr_col(years)]
+
+def headline(summary, forecast, years=None):
+    return headline_from(summary["Market Name"], *forecast_columns(forecast, years), years=years)
+
+def breakup_rows(table, name, years=None):
+    base, forecast = years or (BASE_YEAR, FORECAST_YEAR)
+    return series_rows(*value_table_rows(list(table), list(zip(*table.values())), name, years), forecast - base)
+
+@timed("parse")
+def parse_inputs(tables, read_times=None, ai_ticket=None, years=None):
+    summary = tables["Summary"]
+    breakups = {}
+    for name, table in tables.items():
+        if not name.startswith(BREAKUP_PREFIX): continue
+        try:
+            breakups[name] = breakup_rows(table, name, years)
+        except ValueError:
+            if name in BREAKUP_BANDS: raise
+    return assemble(summary["Market Name"], summary["Units"], *forecast_columns(tables["Sales_Forecast"], years),
+                    breakups, read_times, ai_ticket, years)
@@ -0,0 +1,88 @@
+# ---------- DECK INPUTS ----------
+# The normalized data the slides are built from, independent of how the workbook was read.
+# Readers (frame_parser.py with pandas, lean_reader.py with openpyxl only) extract plain
+# Python columns and call assemble(); nothing here uses pandas or numpy.
+
+import os
+
+TABLE_DECIMALS = 1
+
+# breakup table columns, the particulars row and the slide 34 narrative (BASE_YEAR /
+# FORECAST_YEAR, or years=(base, forecast) through parse_inputs); data["years"] records them
+BASE_YEAR     = int(os.environ.get("BASE_YEAR", "2024"))
+FORECAST_YEAR = int(os.environ.get("FORECAST_YEAR", "2033"))
+DEFAULT_YEARS = (BASE_YEAR, FORECAST_YEAR)
+HISTORY_START = 2019   # the slide 34 chart runs from here to the base year
+
+# breakup sheet -> slide 33 band rows; other By_* sheets are parsed into data["breakups"] only
+BREAKUP_BANDS = {"By_Type": "rows_type", "By_Source": "rows_src", "By_Region": "rows_reg"}
+
+# Summary (first column = label) and Sales_Forecast columns
+SUMMARY_VALUE = "Value"
+YEAR_COL, SALES_COL = "Year", "Sales Value (Million USD)"
+
+def cagr_col(years=None):
+    # the history CAGR column is named for its period: "CAGR 2019–2024 (%)" for base year 2024
+    return f"CAGR {period(HISTORY_START, (years or DEFAULT_YEARS)[0])} (%)"
+
+def period(start, end): return f"{start}–{end}"
+
+def is_blank(x): return x is None or (isinstance(x, float) and x != x)
+
+def musd(x, decimals=TABLE_DECIMALS):
+    if is_blank(x): return ""
+    return f"{float(x):,.{decimals}f}"
+
+def unit_label_from_summary(units_str):
+    u = (units_str or "").lower()
+    if "million" in u: return "Million US$"
+    if "billion" in u: return "Billion US$"
+    return units_str or ""
+
+def cagr(v0, v1, n_years):
+    try:
+        v0 = float(v0); v1 = float(v1)
+        if v0 <= 0 or v1 <= 0 or n_years <= 0: return ""
+        return ((v1 / v0) ** (1.0 / n_years) - 1.0) * 100.0
+    except Exception:
+        return ""
+
+def fmt_pct(p): return "" if p == "" or is_blank(p) else f"{float(p):.1f}%"
+
+def series_rows(names, base_values, forecast_values, n_years):
+    # (name, base, forecast, CAGR) table rows from plain floats (NaN for blanks)
+    return [(name, musd(v0), musd(v1), fmt_pct(cagr(v0, v1, n_years)))
+            for name, v0, v1 in zip(names, base_values, forecast_values)]
+
+def value_in_year(years, values, year):
+    # first row for `year`, like forecast.loc[forecast["Year"] == year, col].values[0]
+    for y, v in zip(years, values):
+        if y == year: return v
+    raise IndexError(f"no {year} row in Sales_Forecast")
+
+def headline_from(market_name, year_values, sales, cagrs, years=None):
+    base, _ = years or DEFAULT_YEARS
+    return market_name, value_in_year(year_values, sales, base), value_in_year(year_values, cagrs, base)
+
+# forecast columns are Sales_Forecast's Year / Sales Value / CAGR values in sheet order;
+# breakups: {sheet: series_rows(...)}
+def assemble(market_name, units, year_values, sales, cagrs, breakups, read_times=None, ai_ticket=None, years=None):
+    base, forecast = years or DEFAULT_YEARS
+    market_name, value_base, cagr_history = headline_from(market_name, year_values, sales, cagrs, years)
+    value_forecast = value_in_year(year_values, sales, forecast)
+    history = [(y, v) for y, v in zip(year_values, sales) if not is_blank(y) and HISTORY_START <= y <= base]
+    data = {
+        "market_name":    market_name,
+        "unit_label":     unit_label_from_summary(units),
+        "history":        ([y for y, _ in history], [v for _, v in history]),
+        "years":          (base, forecast),
+        "value_base":     value_base,
+        "value_forecast": value_forecast,
+        "cagr_history":   cagr_history,
+        "cagr_forecast":  cagr(value_base, value_forecast, forecast - base),
+        "breakups":       breakups,
+        "read_times":     read_times or {},
+        "ai_ticket":      ai_ticket,
+    }
+    for sheet, key in BREAKUP_BANDS.items(): data[key] = breakups[sheet]
+    return data
@@ -0,0 +1,62 @@
+import os, json, tempfile, threading
+from collections import OrderedDict
+
+# ---------- FILL PLAN STORE ----------
+# A fill plan is the JSON-able result of analysing a template once (shape paths, band
+# boundaries, rows available per band). Plans are keyed by the template's content hash,
+# kept in memory, and persisted as "<hash>.plan.json" under PLAN_CACHE_DIR (beside the
+# result cache by default, never in the source tree), so uploaded templates reuse them too.
+# A stored plan whose hash or version no longer matches is recompiled and overwritten.
+
+PLAN_CACHE_MAX_ENTRIES = int(os.environ.get("PLAN_CACHE_MAX_ENTRIES", "64"))
+PLAN_CACHE_DIR         = os.environ.get("PLAN_CACHE_DIR", os.path.join(tempfile.gettempdir(), "imarc_plans"))
+
+def plan_path_for(key, root=PLAN_CACHE_DIR): return os.path.join(root, f"{key}.plan.json")
+
+def read_plan_file(path, key, version):
+    try:
+        with open(path, "r", encoding="utf-8") as f: plan = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if plan.get("template_hash") != key or plan.get("version") != version: return None
+    return plan
+
+def write_plan_file(path, plan):
+    # best effort: read-only deployments (e.g. serverless bundles) just keep the in-memory copy
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f: json.dump(plan, f)
+        os.replace(tmp, path)
+    except OSError:
+        try: os.remove(tmp)
+        except OSError: pass
+
+class PlanStore:
+    def __init__(self, max_entries=PLAN_CACHE_MAX_ENTRIES, root=PLAN_CACHE_DIR):
+        self.max_entries = max_entries
+        self.root        = root
+        self._plans = OrderedDict()
+        self._lock  = threading.Lock()
+
+    def get(self, key, version, compile_fn):
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None and plan.get("version") == version:
+                self._plans.move_to_end(key)
+                return plan
+        path = plan_path_for(key, self.root)
+        plan = read_plan_file(path, key, version)
+        if plan is None:
+            plan = dict(compile_fn(), template_hash=key, version=version)
+            write_plan_file(path, plan)
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_entries: self._plans.popitem(last=False)
+        return plan
+
+    def clear(self):
+        with self._lock: self._plans.clear()
+
+plan_store = PlanStore()
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+from deck_inputs import (BASE_YEAR, FORECAST_YEAR, BREAKUP_BANDS, TABLE_DECIMALS, SUMMARY_VALUE,
+                         YEAR_COL, SALES_COL, cagr_col, headline_from, assemble)
+from workbook import iter_sheets, iter_market_blocks, BREAKUP_PREFIX
+from timing import timed
+
+# ---------- PANDAS WORKBOOK READER ----------
+# Sheets are read into DataFrames (workbook.py) and the breakup tables located and
+# formatted column-at-a-time with pandas/numpy. lean_reader.py is the openpyxl-only
+# counterpart; both produce the same deck_inputs.assemble() data.
+
+# ---------- ROBUST SHEET PARSER ----------
+
+def read_sales_value_table(xlsx_path, sheet_name, years=None):
+    return sales_value_table_from_raw(pd.read_excel(xlsx_path, sheet_name=sheet_name, header=None), sheet_name, years)
+
+def _first(mask, start=0):
+    hits = np.flatnonzero(mask[start:])
+    return start + int(hits[0]) if len(hits) else None
+
+# Whole-column scans instead of walking raw.iloc cell by cell: the title is the first
+# "market breakup ... sales value" row in column 0 (volume/share tables stacked above or
+# below it are skipped), the header is the next row, and the body ends at the next
+# "market breakup" title, at a blank row after the first body row, or after "Total".
+def locate_value_table(raw, sheet_name):
+    col0 = raw.iloc[:, 0]
+    text = col0.where(col0.notna(), "").astype(str).str.strip().str.lower()
+    is_title = (text.str.contains("market breakup", regex=False) & text.str.contains("sales value", regex=False)).to_numpy()
+    title_idx = _first(is_title)
+    if title_idx is None or title_idx + 1 >= len(raw):
+        raise ValueError(f"Couldn't find 'Sales Value' title in sheet '{sheet_name}'")
+    header_idx = title_idx + 1
+    body = text.to_numpy()[header_idx + 1:]
+    ends = [len(body),
+            _first(np.char.startswith(body.astype(str), "market breakup")),
+            _first(body == "", 1),                     # a blank first row is still read
+            (lambda i: None if i is None else i + 1)(_first(body == "total"))]
+    return header_idx, min(e for e in ends if e is not None)
+
+def year_column(labels, year):
+    # exact label first ("2024"), then numeric equality (2024.0, " 2024 ")
+    exact = np.flatnonzero(labels == str(year))
+    if len(exact): return int(exact[0])
+    numeric = np.flatnonzero(pd.to_numeric(pd.Series(labels), errors="coerce").to_numpy() == float(year))
+    return int(numeric[0]) if len(numeric) else None
+
+def sales_value_table_from_raw(raw, sheet_name, years=None):
+    base, forecast = years or (BASE_YEAR, FORECAST_YEAR)
+    header_idx, n_body = locate_value_table(raw, sheet_name)
+    labels = np.array([str(x).strip() for x in raw.iloc[header_idx].tolist()])
+    col_base, col_fc = year_column(labels, base), year_column(labels, forecast)
+    if col_base is None or col_fc is None:
+        raise ValueError(f"{sheet_name}: couldn't find {base}/{forecast} in {list(labels)}")
+
+    df = raw.iloc[header_idx + 1:header_idx + 1 + n_body, [0, col_base, col_fc]].reset_index(drop=True)
+    df.columns = [labels[0], base, forecast]
+    name_col = df.columns[0]
+    # header repeats and the total row; the first header label covers any By_* sheet
+    bad = {"total", "type", "source", "region", "", labels[0].lower()}
+    mask = df[name_col].astype(str).str.strip().str.lower()
+    df = df[~mask.isin(bad)].copy()
+    df[base] = pd.to_numeric(df[base], errors="coerce")
+    df[forecast] = pd.to_numeric(df[forecast], errors="coerce")
+    return df.dropna(subset=[base, forecast])
+
+# Column-at-a-time equivalents of musd / cagr / fmt_pct: blanks format as "", and a CAGR
+# over a non-positive (or blank) endpoint is "" exactly like the scalar helpers.
+def musd_array(values, decimals=TABLE_DECIMALS):
+    return ["" if v != v else f"{v:,.{decimals}f}" for v in values.tolist()]
+
+def cagr_array(v0, v1, n_years):
+    if n_years <= 0: return np.full(len(v0), np.nan)
+    with np.errstate(all="ignore"):
+        out = ((v1 / v0) ** (1.0 / n_years) - 1.0) * 100.0
+    out[(v0 <= 0) | (v1 <= 0)] = np.nan
+    return out
+
+def fmt_pct_array(values):
+    return ["" if p != p else f"{p:.1f}%" for p in values.tolist()]
+
+def series_from_sheet(df, years=None):
+    base, forecast = years or (BASE_YEAR, FORECAST_YEAR)
+    names = df[df.columns[0]].astype(str).str.strip().tolist()
+    v0 = np.asarray(df[base], dtype=float)
+    v1 = np.asarray(df[forecast], dtype=float)
+    return list(zip(names, musd_array(v0), musd_array(v1), fmt_pct_array(cagr_array(v0, v1, forecast - base))))
+
+# ---------- LOAD ----------
+
+def forecast_columns(forecast, years=None):
+    return (forecast[YEAR_COL].tolist(), forecast[SALES_COL].tolist(), forecast[cagr_col(years)].tolist())
+
+def headline(summary, forecast, years=None):
+    return headline_from(summary.loc["Market Name", SUMMARY_VALUE], *forecast_columns(forecast, years), years=years)
+
+# raw sheet frames -> the numbers and table rows the slides need; years: (base, forecast)
+@timed("parse")
+def parse_inputs(sheets, read_times=None, ai_ticket=None, years=None):
+    summary = sheets["Summary"]
+    breakups = {}
+    for name, raw in sheets.items():
+        if not name.startswith(BREAKUP_PREFIX): continue
+        try:
+            breakups[name] = series_from_sheet(sales_value_table_from_raw(raw, name, years), years)
+        except ValueError:
+            if name in BREAKUP_BANDS: raise   # extra sheets without a sales value table are skipped
+    return assemble(summary.loc["Market Name", SUMMARY_VALUE], summary.loc["Units", SUMMARY_VALUE],
+                    *forecast_columns(sheets["Sales_Forecast"], years), breakups, read_times, ai_ticket, years)
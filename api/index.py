@@ -1,9 +1,47 @@
-from flask import Flask, request, send_file
-import io, os, sys, tempfile, shutil, uuid, subprocess
+from flask import Flask, Request, Response, request, send_file, stream_with_context, url_for
+import io, os, sys, time, uuid, zipfile, itertools, traceback, contextvars
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+sys.path.insert(0, os.path.dirname(__file__))
+# heavy imports (python-pptx, openpyxl, pandas unless WORKBOOK_READER=openpyxl) happen
+# once per worker, not per request
+from generate_poc import generate_deck, workbook_reader, GenerationTimeout
+from batch import (iter_workbooks, stream_batch_zip, is_workbook_name, acquire_batch_slot, release_batch_slot,
+                   BATCH_CONCURRENCY)
+from market_decks import load_markets, stream_markets_zip, NoMarkets
+from memstat import PeakRss, mb
+from job_queue import JobQueue, QueueFull, DONE, FAILED, ASYNC_JOBS, JOB_BACKEND
+from template_cache import template_cache
+from ai_paragraph import paragraph_service
+from result_cache import result_cache, result_key, buffer_digest
+from preflight import validate_workbook, check_workbook, WorkbookInvalid
+from timing import (span, note, start_timeline, end_timeline, log_event, stage_latency, PROFILE_DIR,
+                    profile_path, run_profiled)
+
+MB = 1024 * 1024
+MAX_EXCEL_BYTES    = int(os.environ.get("MAX_EXCEL_BYTES", str(25 * MB)))
+MAX_TEMPLATE_BYTES = int(os.environ.get("MAX_TEMPLATE_BYTES", str(100 * MB)))
+MAX_REQUEST_BYTES  = int(os.environ.get("MAX_REQUEST_BYTES", str(200 * MB)))
+
+class InMemoryRequest(Request):
+    # Uploads are parsed from the request stream into memory (werkzeug's default spills
+    # anything over 500KB to a temp file). The total is already bounded by MAX_CONTENT_LENGTH,
+    # which werkzeug checks against Content-Length before reading the body.
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return io.BytesIO()
 
 app = Flask(__name__)
+app.request_class = InMemoryRequest
+app.config["MAX_CONTENT_LENGTH"] = MAX_REQUEST_BYTES
 
 DEFAULT_TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "default_template.pptx")
+GENERATE_TIMEOUT_S    = 120
+GENERATE_WORKERS      = int(os.environ.get("GENERATE_WORKERS", "4"))
+
+workbook_reader()
+
+_pool = ThreadPoolExecutor(max_workers=GENERATE_WORKERS, thread_name_prefix="generate")
 
 # --- Health: match "/" and "/api" (and optional trailing slash) ---
 @app.get("/")
@@ -11,62 +49,293 @@ DEFAULT_TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "default_templat
 def health():
     return {"status": "ok"}
 
+# --- Metrics: per-stage latency histograms (Prometheus text format) ---
+@app.get("/metrics")
+@app.get("/api/metrics")
+def metrics():
+    return Response(stage_latency.render(), mimetype="text/plain; version=0.0.4")
+
+# part of the result-cache key: decks made with and without the AI paragraph differ, and an
+# unconfigured provider (e.g. gemini without GEMINI_API_KEY) makes the same deck as "off"
+def ai_setting(use_ai=True):
+    provider = paragraph_service.provider
+    return f"{use_ai}:{provider.name if use_ai and provider.available else 'off'}"
+
+def template_digest(template):
+    # uploaded templates (stream or bytes) hash like the workbook; the server template by file key
+    if isinstance(template, str): return template_cache.key_for(template)
+    return buffer_digest(io.BytesIO(template) if isinstance(template, bytes) else template)
+
+def deck_key(excel_stream, template):
+    return result_key(buffer_digest(excel_stream), template_digest(template), ai_setting())
+
+# a deck whose AI paragraph missed its deadline is not cached under the AI deck's key
+def cacheable(paragraph): return paragraph != "fallback"
+
+def cached_deck(key, produce, bypass=None):
+    # produce(out) writes the deck and returns cacheable(...) -> (path or in-memory file, outcome);
+    # `bypass` names the outcome when the cache is skipped for this call
+    if result_cache.enabled and not bypass:
+        return result_cache.get_or_create(key, produce, wait_timeout=GENERATE_TIMEOUT_S)
+    body = io.BytesIO()
+    produce(body); body.seek(0)
+    return body, bypass or "off"
+
+def upload_size(f):
+    stream = f.stream
+    pos = stream.tell(); size = stream.seek(0, os.SEEK_END); stream.seek(pos)
+    return size
+
+def too_large(f, limit, what):
+    size = upload_size(f)
+    if size > limit: return (f"{what} too large ({mb(size)} MB, limit {mb(limit)} MB)", 413)
+    return None
+
+@app.errorhandler(413)
+def request_too_large(e):
+    return (f"Upload too large (limit {mb(app.config['MAX_CONTENT_LENGTH'])} MB per request)", 413)
+
+PPTX_MIMETYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+# the 'excel' upload may also be a JSON document or a .zip bundle of CSV/Parquet/Arrow tables
+WORKBOOK_EXTENSIONS = (".xlsx", ".xls")
+INPUT_EXTENSIONS = WORKBOOK_EXTENSIONS + (".json", ".zip")
+
+def excel_upload(extensions=INPUT_EXTENSIONS):
+    # -> (excel, error response or None)
+    if "excel" not in request.files:
+        return None, ("Missing file: need 'excel'", 400)
+    excel = request.files["excel"]
+    if not excel.filename.lower().endswith(extensions):
+        if extensions == WORKBOOK_EXTENSIONS: return None, ("Excel must be .xlsx or .xls", 400)
+        return None, ("Excel must be .xlsx or .xls (or .json / .zip table bundle)", 400)
+    return excel, too_large(excel, MAX_EXCEL_BYTES, "Excel")
+
+def invalid_workbook(problems):
+    return ({"ok": False, "errors": problems}, 422)
+
+# shared checks for the single-deck routes -> (excel, template or None, error response or None)
+def generation_uploads(extensions=INPUT_EXTENSIONS):
+    excel, err = excel_upload(extensions)
+    if err: return None, None, err
+    ppt = request.files.get("template")
+
+    if ppt and ppt.filename and (not ppt.filename.lower().endswith(".pptx")):
+        return None, None, ("Template must be .pptx", 400)
+
+    if (not ppt or not ppt.filename) and not os.path.exists(DEFAULT_TEMPLATE_PATH):
+        return None, None, ("Server template missing. Please add api/default_template.pptx to the repo.", 500)
+
+    err = too_large(ppt, MAX_TEMPLATE_BYTES, "Template") if ppt and ppt.filename else None
+    return excel, (ppt if ppt and ppt.filename else None), err
+
+# --- Preflight: checks the workbook's sheets, titles, year columns and Summary rows, no deck ---
+@app.route("/validate", methods=["POST"])
+@app.route("/api/validate", methods=["POST"])
+def validate():
+    excel, err = excel_upload()
+    if err: return err
+    t0 = time.perf_counter()
+    problems = validate_workbook(excel.stream)
+    ms = round((time.perf_counter() - t0) * 1000, 1)
+    if problems: return ({"ok": False, "errors": problems, "ms": ms}, 422)
+    return {"ok": True, "errors": [], "ms": ms}
+
 # --- POST: match "/" and "/api" (works for both ways Vercel mounts the path) ---
 @app.route("/", methods=["POST"])
+@app.route("/api", methods=["POST"])
 def generate():
-    if "excel" not in request.files:
-        return ("Missing file: need 'excel'", 400)
+    timeline = start_timeline()
+    try:
+        return _generate(timeline)
+    finally:
+        end_timeline(timeline)
 
-    excel = request.files["excel"]
-    ppt   = request.files.get("template")
+def _generate(timeline):
+    with span("upload"):
+        excel, ppt, err = generation_uploads()
+        if err: return err
+
+        # the in-memory upload streams go straight to the engine; the deck is written straight
+        # into the result cache, and a repeat of the same inputs is served from there
+        template = ppt.stream if ppt else DEFAULT_TEMPLATE_PATH
+        key = deck_key(excel.stream, template)
+
+    # ?profile=1 (only when PROFILE_DIR is set) dumps a cProfile of this request's generation
+    profile = PROFILE_DIR and request.args.get("profile") == "1"
+    run = partial(run_profiled, profile_path(uuid.uuid4().hex[:8]), generate_deck) if profile else generate_deck
+
+    # the engine also checks the deadline between stages, so a timed-out job frees its worker early
+    deadline = time.monotonic() + GENERATE_TIMEOUT_S
+    def produce(out):
+        # only on a cache miss: a bad workbook is answered before it takes a generation worker
+        with span("validate"): check_workbook(excel.stream)
+        # copy_context() carries the request timeline into the worker thread
+        future = _pool.submit(contextvars.copy_context().run, run, excel.stream, template, out=out,
+                              deadline=deadline, validate=False)
+        try:
+            return cacheable(future.result(timeout=max(0.0, deadline - time.monotonic())))
+        except FutureTimeout:
+            future.cancel()   # still queued: never starts; running: stops at its next deadline check
+            raise
+
+    with PeakRss() as rss:
+        try:
+            body, outcome = cached_deck(key, produce, bypass="profile" if profile else None)
+        except WorkbookInvalid as e:
+            return invalid_workbook(e.problems)
+        except (FutureTimeout, GenerationTimeout):
+            return (f"Generation timed out after {GENERATE_TIMEOUT_S}s", 504)
+        except Exception:
+            return (f"Script failed\n{traceback.format_exc()}", 500)
+    log_event("generate", timeline, rss, cache=outcome, excel_mb=float(mb(upload_size(excel))))
 
-    if not excel.filename.lower().endswith((".xlsx", ".xls")):
+    resp = send_file(
+        body,
+        mimetype=PPTX_MIMETYPE,
+        as_attachment=True,
+        download_name="updated_poc.pptx",
+    )
+    resp.headers["X-Result-Cache"] = outcome
+    resp.headers["X-Peak-RSS-MB"] = mb(rss.peak)
+    resp.headers["X-RSS-Delta-MB"] = mb(rss.delta)
+    if timeline: resp.headers["Server-Timing"] = timeline.server_timing()
+    if profile: resp.headers["X-Profile-Dump"] = os.path.basename(run.args[0])
+    return resp
+
+# --- Cache counters: the result cache at the top level, in-process caches under their own keys ---
+@app.get("/cache")
+@app.get("/api/cache")
+def cache_stats():
+    stats = result_cache.stats()
+    stats["paragraphs"] = paragraph_service.stats()
+    stats["templates"] = template_cache.stats()
+    if _jobs is not None: stats["jobs"] = {"backend": JOB_BACKEND, "queued": _jobs.depth}
+    return stats
+
+def zip_response(chunks, filename):
+    # batch and multi-market zips hold a batch slot (BATCH_CONCURRENCY per process, each with
+    # its own worker processes) until the response is closed
+    if not acquire_batch_slot():
+        return (f"Busy: {BATCH_CONCURRENCY} batch(es) already running", 503, {"Retry-After": "5"})
+    resp = Response(stream_with_context(chunks), mimetype="application/zip",
+                    headers={"Content-Disposition": f"attachment; filename={filename}"})
+    resp.call_on_close(release_batch_slot)
+    return resp
+
+# --- Batch: zip of workbooks (or several 'excel' files) + optional shared template -> zip of decks ---
+@app.route("/batch", methods=["POST"])
+@app.route("/api/batch", methods=["POST"])
+def generate_batch():
+    archive = request.files.get("archive")
+    excels  = [f for f in request.files.getlist("excel") if f and f.filename]
+    ppt     = request.files.get("template")
+
+    if not archive and not excels:
+        return ("Missing files: need 'archive' (.zip of workbooks) or one or more 'excel'", 400)
+    if archive and not archive.filename.lower().endswith(".zip"):
+        return ("Archive must be .zip", 400)
+    if any(not is_workbook_name(f.filename) for f in excels):
         return ("Excel must be .xlsx or .xls", 400)
     if ppt and ppt.filename and (not ppt.filename.lower().endswith(".pptx")):
         return ("Template must be .pptx", 400)
-
     if (not ppt or not ppt.filename) and not os.path.exists(DEFAULT_TEMPLATE_PATH):
         return ("Server template missing. Please add api/default_template.pptx to the repo.", 500)
 
-    work = os.path.join(tempfile.gettempdir(), f"imarc_{uuid.uuid4().hex}")
-    os.makedirs(work, exist_ok=True)
+    for f in excels:
+        err = too_large(f, MAX_EXCEL_BYTES, f"Excel {f.filename}")
+        if err: return err
+
+    # workbooks are read (and archive entries decompressed) only as batch workers take them;
+    # the first is read here so an invalid or empty upload is still answered with a 400
+    workbooks = itertools.chain(iter_workbooks(archive.stream, MAX_EXCEL_BYTES) if archive else (),
+                                ((f.filename, f.read()) for f in excels))
     try:
-        excel_path = os.path.join(work, "datasheet_imarc.xlsx")
-        ppt_path   = os.path.join(work, "template.pptx")
-
-        excel.save(excel_path)
-        if ppt and ppt.filename:
-            ppt.save(ppt_path)
-        else:
-            shutil.copyfile(DEFAULT_TEMPLATE_PATH, ppt_path)
-
-        script_src = os.path.join(os.path.dirname(__file__), "generate_poc.py")
-        script_dst = os.path.join(work, "generate_poc.py")
-        shutil.copyfile(script_src, script_dst)
-
-        proc = subprocess.run(
-            [sys.executable, script_dst],
-            cwd=work,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=120,
-        )
-        if proc.returncode != 0:
-            return (f"Script failed\nSTDOUT:\n{proc.stdout}\n\nSTDERR:\n{proc.stderr}", 500)
-
-        out_path = os.path.join(work, "updated_poc.pptx")
-        if not os.path.exists(out_path):
-            return ("Output PPTX not found (expected 'updated_poc.pptx')", 500)
-
-        with open(out_path, "rb") as f:
-            data = f.read()
-        return send_file(
-            io.BytesIO(data),
-            mimetype="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-            as_attachment=True,
-            download_name="updated_poc.pptx",
-        )
-    finally:
-        try: shutil.rmtree(work)
-        except Exception: pass
+        first = next(workbooks, None)
+    except zipfile.BadZipFile:
+        return ("Archive is not a valid zip", 400)
+    if first is None:
+        return ("No .xlsx/.xls workbooks found in upload", 400)
+    template = ppt.read() if ppt and ppt.filename else DEFAULT_TEMPLATE_PATH
+
+    return zip_response(stream_batch_zip(itertools.chain([first], workbooks), template), "decks.zip")
+
+# --- Multi-market: one consolidated workbook (+ optional template) -> zip with a deck per market ---
+@app.route("/markets", methods=["POST"])
+@app.route("/api/markets", methods=["POST"])
+def generate_markets():
+    # consolidated workbooks only: market blocks are read from sheet prefixes
+    excel, ppt, err = generation_uploads(WORKBOOK_EXTENSIONS)
+    if err: return err
+    try:
+        markets = load_markets(excel.stream)   # parsed once; workers only build and save
+    except NoMarkets as e:
+        return (str(e), 400)
+    except Exception:
+        return (f"Could not read workbook\n{traceback.format_exc(limit=3)}", 400)
+    template = ppt.read() if ppt else DEFAULT_TEMPLATE_PATH
+
+    return zip_response(stream_markets_zip(markets, template), "markets.zip")
+
+# --- Async jobs (ASYNC_JOBS=1): POST returns a job id at once; poll the status route, then download ---
+# polls can land on another process than the submit, so job state must live in the shared store
+if ASYNC_JOBS and JOB_BACKEND != "sqlite":
+    raise RuntimeError("ASYNC_JOBS=1 needs JOB_BACKEND=sqlite (job state shared by every process)")
+
+def run_job(excel, template, progress=None, deadline=None):
+    # same key and produce path as POST /, so jobs are answered from and fill the result cache
+    def produce(out):
+        return cacheable(generate_deck(io.BytesIO(excel), template, out=out, progress=progress,
+                                       deadline=deadline, validate=False))
+    body, outcome = cached_deck(deck_key(io.BytesIO(excel), template), produce)
+    note(cache=outcome, excel_mb=float(mb(len(excel))))   # for the job's event line
+    if isinstance(body, str):
+        with open(body, "rb") as f: return f.read()
+    return body.getvalue()
+
+_jobs = JobQueue(run_job, timeout_s=GENERATE_TIMEOUT_S) if ASYNC_JOBS else None
+
+def jobs_disabled():
+    return ({"error": "Async jobs are disabled (set ASYNC_JOBS=1 with JOB_BACKEND=sqlite)"}, 404)
+
+def job_view(job):
+    view = {k: job[k] for k in ("id", "status", "stage", "progress", "error", "created", "updated", "expires")}
+    view["status_url"] = url_for("job_status", job_id=job["id"])
+    if job["status"] == DONE: view["download_url"] = url_for("job_download", job_id=job["id"])
+    return view
+
+@app.route("/jobs", methods=["POST"])
+@app.route("/api/jobs", methods=["POST"])
+def submit_job():
+    if _jobs is None: return jobs_disabled()
+    excel, ppt, err = generation_uploads()
+    if err: return err
+    problems = validate_workbook(excel.stream)
+    if problems: return invalid_workbook(problems)
+    # job inputs must outlive the request, so they are read into bytes here
+    template = ppt.read() if ppt else DEFAULT_TEMPLATE_PATH
+    excel.stream.seek(0)
+    try:
+        job_id = _jobs.submit(excel.read(), template)
+    except QueueFull as e:
+        return ({"error": f"Busy: {e}"}, 503, {"Retry-After": "5"})
+    return (job_view(_jobs.status(job_id)), 202, {"Location": url_for("job_status", job_id=job_id)})
+
+@app.get("/jobs/<job_id>")
+@app.get("/api/jobs/<job_id>")
+def job_status(job_id):
+    if _jobs is None: return jobs_disabled()
+    job = _jobs.status(job_id)
+    if job is None: return ({"error": "Unknown or expired job"}, 404)
+    return job_view(job)
+
+@app.get("/jobs/<job_id>/download")
+@app.get("/api/jobs/<job_id>/download")
+def job_download(job_id):
+    if _jobs is None: return jobs_disabled()
+    job, data = _jobs.result(job_id)
+    if job is None: return ({"error": "Unknown or expired job"}, 404)
+    if job["status"] == FAILED: return (job_view(job), 500)
+    if data is None: return (job_view(job), 409)
+    return send_file(io.BytesIO(data), mimetype=PPTX_MIMETYPE, as_attachment=True,
+                     download_name="updated_poc.pptx")
@@ -0,0 +1,229 @@
+import os, time, json, uuid, queue, socket, sqlite3, tempfile, threading, traceback
+
+from memstat import PeakRss
+from timing import start_timeline, end_timeline, log_event
+
+# ---------- ASYNC JOBS ----------
+# POST returns a job id immediately; a bounded pool of worker threads runs the generation
+# and records stage progress, and clients poll for status and download the result.
+# The queue itself is bounded: when it is full, submit() raises QueueFull and the route
+# answers 503 + Retry-After instead of piling up work.
+#
+# Job state and finished decks live in a pluggable store: JOB_BACKEND=memory (default)
+# or sqlite (JOB_DB path), neither needs an external service. Finished results expire
+# after JOB_RESULT_TTL_S; the memory store also drops the oldest finished jobs once their
+# results pass JOB_RESULT_MAX_BYTES. Queued inputs are held in memory by the worker pool,
+# so a job still queued or running when its process exits can never finish: the sqlite
+# store, which several processes may share, marks such jobs failed when it is opened
+# (only those of processes on this host that are no longer running).
+#
+# The job routes are off unless ASYNC_JOBS=1. A status poll may reach a different process
+# (or serverless instance) than the submit, so the mode requires JOB_BACKEND=sqlite with
+# JOB_DB on storage all of them share; the single blocking POST stays the default.
+
+ASYNC_JOBS       = os.environ.get("ASYNC_JOBS", "0") == "1"
+JOB_BACKEND      = os.environ.get("JOB_BACKEND", "memory").lower()
+JOB_DB           = os.environ.get("JOB_DB", os.path.join(tempfile.gettempdir(), "imarc_jobs.sqlite"))
+JOB_WORKERS      = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_QUEUE_MAX    = int(os.environ.get("JOB_QUEUE_MAX", "16"))
+JOB_TIMEOUT_S    = int(os.environ.get("JOB_TIMEOUT_S", "120"))
+JOB_RESULT_TTL_S = int(os.environ.get("JOB_RESULT_TTL_S", "3600"))
+JOB_RESULT_MAX_BYTES = int(os.environ.get("JOB_RESULT_MAX_BYTES", str(256 * 1024 * 1024)))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+FINISHED = (DONE, FAILED)
+
+class QueueFull(Exception):
+    pass
+
+# ---------- STORES ----------
+# A store keeps job dicts (see new_job) plus the result bytes of finished jobs.
+
+HOST = socket.gethostname()
+
+def new_job(job_id, now):
+    return {"id": job_id, "status": QUEUED, "stage": QUEUED, "progress": 0, "error": None,
+            "created": now, "updated": now, "expires": None, "result_bytes": None,
+            "owner": {"host": HOST, "pid": os.getpid()}}
+
+def pid_alive(pid):
+    try: os.kill(pid, 0)
+    except ProcessLookupError: return False
+    except PermissionError: return True
+    return True
+
+def owner_gone(job):
+    # the process that holds the job's inputs has exited (pids are only checked on this host;
+    # jobs recorded without an owner predate it)
+    owner = job.get("owner")
+    if not owner: return True
+    return owner.get("host") == HOST and not pid_alive(owner.get("pid", 0))
+
+class MemoryJobStore:
+    def __init__(self, max_bytes=JOB_RESULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._jobs, self._results = {}, {}   # results in insertion order, oldest first
+        self._result_total = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def create(self, job):
+        with self._lock: self._jobs[job["id"]] = dict(job)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs: self._jobs[job_id].update(fields)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _drop(self, job_id):
+        self._jobs.pop(job_id, None)
+        data = self._results.pop(job_id, None)
+        if data is not None: self._result_total -= len(data)
+
+    def put_result(self, job_id, data):
+        # over the cap, the oldest finished jobs go as if expired; never the one just stored
+        with self._lock:
+            old = self._results.pop(job_id, None)
+            if old is not None: self._result_total -= len(old)
+            self._results[job_id] = data
+            self._result_total += len(data)
+            while self._result_total > self.max_bytes and len(self._results) > 1:
+                self._drop(next(iter(self._results)))
+                self.evictions += 1
+
+    def get_result(self, job_id):
+        with self._lock: return self._results.get(job_id)
+
+    def purge_expired(self, now):
+        with self._lock:
+            dead = [k for k, j in self._jobs.items() if j["expires"] is not None and j["expires"] <= now]
+            for k in dead: self._drop(k)
+        return len(dead)
+
+class SqliteJobStore:
+    def __init__(self, path=JOB_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, doc TEXT NOT NULL, "
+                         "expires REAL, result BLOB)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_expires ON jobs (expires)")
+        self._fail_interrupted()
+
+    def _fail_interrupted(self):
+        now = time.time()
+        for job_id, doc in self._db.execute("SELECT id, doc FROM jobs WHERE expires IS NULL").fetchall():
+            job = json.loads(doc)
+            if job["status"] not in FINISHED and owner_gone(job):
+                job.update(status=FAILED, error="interrupted by a server restart",
+                           updated=now, expires=now + JOB_RESULT_TTL_S)
+                self._write(job)
+
+    def _write(self, job):
+        self._db.execute("INSERT INTO jobs (id, doc, expires) VALUES (?, ?, ?) "
+                         "ON CONFLICT(id) DO UPDATE SET doc = excluded.doc, expires = excluded.expires",
+                         (job["id"], json.dumps(job), job["expires"]))
+
+    def create(self, job):
+        with self._lock: self._write(job)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            row = self._db.execute("SELECT doc FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None: return
+            job = json.loads(row[0]); job.update(fields)
+            self._write(job)
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._db.execute("SELECT doc FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_result(self, job_id, data):
+        with self._lock: self._db.execute("UPDATE jobs SET result = ? WHERE id = ?", (data, job_id))
+
+    def get_result(self, job_id):
+        with self._lock:
+            row = self._db.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bytes(row[0]) if row and row[0] is not None else None
+
+    def purge_expired(self, now):
+        with self._lock:
+            return self._db.execute("DELETE FROM jobs WHERE expires IS NOT NULL AND expires <= ?", (now,)).rowcount
+
+STORES = {"memory": MemoryJobStore, "sqlite": SqliteJobStore}
+
+def make_store(name=JOB_BACKEND): return STORES[name]()
+
+# ---------- QUEUE ----------
+
+class JobQueue:
+    # fn(*args, progress=callback, deadline=...) -> bytes; progress(stage, percent)
+    def __init__(self, fn, store=None, workers=JOB_WORKERS, max_queued=JOB_QUEUE_MAX,
+                 timeout_s=JOB_TIMEOUT_S, ttl_s=JOB_RESULT_TTL_S):
+        self.fn        = fn
+        self.store     = store or make_store()
+        self.timeout_s = timeout_s
+        self.ttl_s     = ttl_s
+        self._queue    = queue.Queue(maxsize=max_queued)
+        self._threads  = [threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                          for i in range(workers)]
+        for t in self._threads: t.start()
+
+    @property
+    def depth(self): return self._queue.qsize()
+
+    def submit(self, *args):
+        now = time.time()
+        self.store.purge_expired(now)
+        job = new_job(uuid.uuid4().hex, now)
+        self.store.create(job)
+        try:
+            self._queue.put_nowait((job["id"], args))
+        except queue.Full:
+            self.store.update(job["id"], status=FAILED, error="queue full", expires=now)
+            raise QueueFull(f"{self._queue.maxsize} jobs already queued")
+        return job["id"]
+
+    def status(self, job_id):
+        self.store.purge_expired(time.time())
+        return self.store.get(job_id)
+
+    def result(self, job_id):
+        job = self.status(job_id)
+        if job is None or job["status"] != DONE: return job, None
+        return job, self.store.get_result(job_id)
+
+    def _work(self):
+        while True:
+            job_id, args = self._queue.get()
+            try: self._run(job_id, args)
+            finally: self._queue.task_done()
+
+    def _run(self, job_id, args):
+        progress = lambda stage, percent: self.store.update(job_id, stage=stage, progress=percent,
+                                                              updated=time.time())
+        self.store.update(job_id, status=RUNNING, stage="started", updated=time.time())
+        # each job gets its own timeline, logged like a POST / generation ("job" event line)
+        timeline = start_timeline()
+        try:
+            with PeakRss() as rss:
+                data = self.fn(*args, progress=progress, deadline=time.monotonic() + self.timeout_s)
+        except Exception as e:
+            end_timeline(timeline)
+            now = time.time()
+            self.store.update(job_id, status=FAILED, stage=FAILED, error=f"{type(e).__name__}: {e}",
+                              traceback=traceback.format_exc(limit=5), updated=now, expires=now + self.ttl_s)
+            log_event("job", timeline, job=job_id, status=FAILED, error=type(e).__name__)
+            return
+        end_timeline(timeline)
+        now = time.time()
+        self.store.put_result(job_id, data)
+        self.store.update(job_id, status=DONE, stage=DONE, progress=100, result_bytes=len(data),
+                          updated=now, expires=now + self.ttl_s)
+        log_event("job", timeline, rss, job=job_id, status=DONE)
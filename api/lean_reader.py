@@ -0,0 +1,209 @@
+import re, time
+from functools import partial
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from deck_inputs import (BASE_YEAR, FORECAST_YEAR, BREAKUP_BANDS, SUMMARY_VALUE,
+                         YEAR_COL, SALES_COL, cagr_col, is_blank, headline_from, series_rows, assemble)
+from workbook import workbook_sheets, market_prefixes, BREAKUP_PREFIX
+from timing import timed
+
+# ---------- OPENPYXL WORKBOOK READER ----------
+# The lean counterpart of frame_parser.py for cold starts (WORKBOOK_READER=openpyxl):
+# sheets are streamed from one read-only openpyxl workbook into plain lists, with the
+# cell conversion, NA strings and per-column type inference pd.read_excel applies, so
+# parse_inputs() returns exactly what the pandas reader returns. No pandas import, and
+# nothing here uses numpy (openpyxl itself imports it when installed).
+#   header=None      -> [row, ...]
+#   header row       -> {column: [values]}
+#   + index_col=0    -> {label: {column: value}}
+
+NAN = float("nan")
+
+# pandas' default na_values for text cells
+NA_STRINGS = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+              "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+
+_INT = re.compile(r"[+-]?\d+")
+
+def cell_value(cell):
+    # as pandas' openpyxl reader: whole numbers -> int, error cells -> NaN
+    value = cell.value
+    if value is None: return ""
+    if cell.data_type == TYPE_ERROR: return NAN
+    if cell.data_type == TYPE_NUMERIC:
+        return int(value) if int(value) == value else float(value)
+    return value
+
+def sheet_rows(ws):
+    # cell values with trailing blank cells and rows trimmed, padded to one width
+    ws.reset_dimensions()
+    rows, last = [], -1
+    for i, row in enumerate(ws.rows):
+        values = [cell_value(c) for c in row]
+        while values and values[-1] == "": values.pop()
+        if values: last = i
+        rows.append(values)
+    rows = rows[:last + 1]
+    width = max((len(r) for r in rows), default=0)
+    return [r + [""] * (width - len(r)) for r in rows]
+
+def as_number(x):
+    # a value maybe_convert_numeric accepts, else None
+    if isinstance(x, bool): return int(x)
+    if isinstance(x, (int, float)): return x
+    if isinstance(x, str) and "_" not in x:
+        s = x.strip()
+        if _INT.fullmatch(s): return int(s)
+        try: return float(s)
+        except ValueError: return None
+    return None
+
+def infer_column(values):
+    # NA strings -> NaN, then the column becomes numeric (int unless it has blanks or
+    # floats) when every value converts, otherwise keeps its raw values
+    values = [NAN if isinstance(v, str) and v in NA_STRINGS else v for v in values]
+    if values and all(isinstance(v, bool) for v in values): return values
+    numbers = []
+    for v in values:
+        n = as_number(v)
+        if n is None: return values
+        numbers.append(n)
+    if any(isinstance(n, float) for n in numbers): return [float(n) for n in numbers]
+    return numbers
+
+def _columns(rows):
+    return [infer_column(list(col)) for col in zip(*rows)]
+
+def column_names(names):
+    # blank headers -> "Unnamed: i", repeats -> "name.1", as pandas names them
+    out, seen = [], {}
+    for i, name in enumerate(names):
+        name = f"Unnamed: {i}" if is_blank(name) or name == "" else name
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        out.append(name)
+    return out
+
+def read_sheet(ws, header=0, index_col=None):
+    rows = sheet_rows(ws)
+    if header is None:
+        return [list(r) for r in zip(*_columns(rows))] if rows else []
+    names, body = column_names(rows[0]) if rows else [], rows[1:]
+    columns = dict(zip(names, _columns(body) if body else [[] for _ in names]))
+    if index_col is None: return columns
+    labels = columns.pop(names[index_col])
+    table = {}
+    for i, label in enumerate(labels):
+        table.setdefault(label, {name: values[i] for name, values in columns.items()})
+    return table
+
+def open_workbook(src):
+    return load_workbook(src, read_only=True, data_only=True, keep_links=False)
+
+def _parse(wb, name, kwargs):
+    if name not in wb.sheetnames: raise ValueError(f"Worksheet named '{name}' not found")
+    return read_sheet(wb[name], **kwargs)
+
+def iter_sheets(src, sheets=None):
+    # same contract as workbook.iter_sheets, yielding lean sheets
+    t0 = time.perf_counter()
+    wb = open_workbook(src)
+    try:
+        yield "<open>", None, time.perf_counter() - t0
+        if sheets is None:
+            sheets = {name: kwargs for name, (_, kwargs) in workbook_sheets(wb.sheetnames).items()}
+        for name, kwargs in sheets.items():
+            t0 = time.perf_counter()
+            sheet = _parse(wb, name, kwargs)
+            yield name, sheet, time.perf_counter() - t0
+    finally:
+        wb.close()
+
+def _read_block(wb, prefix):
+    return {name: _parse(wb, sheet, kwargs) for sheet, (name, kwargs) in workbook_sheets(wb.sheetnames, prefix).items()}
+
+def iter_market_blocks(src):
+    wb = open_workbook(src)
+    try:
+        for prefix in market_prefixes(wb.sheetnames):
+            yield prefix, partial(_read_block, wb, prefix)
+    finally:
+        wb.close()
+
+# ---------- BREAKUP TABLES ----------
+# Same rules as frame_parser.locate_value_table / sales_value_table_from_raw, on row lists.
+
+def cell_text(x): return "" if is_blank(x) else str(x).strip().lower()
+
+def locate_value_table(rows, sheet_name):
+    text = [cell_text(r[0]) for r in rows]
+    title_idx = next((i for i, t in enumerate(text) if "market breakup" in t and "sales value" in t), None)
+    if title_idx is None or title_idx + 1 >= len(rows):
+        raise ValueError(f"Couldn't find 'Sales Value' title in sheet '{sheet_name}'")
+    header_idx = title_idx + 1
+    body = text[header_idx + 1:]
+    n_body = len(body)
+    for i, t in enumerate(body):
+        if t.startswith("market breakup") or (t == "" and i >= 1): n_body = i; break
+        if t == "total": n_body = i + 1; break
+    return header_idx, n_body
+
+def year_column(labels, year):
+    if str(year) in labels: return labels.index(str(year))
+    for i, label in enumerate(labels):
+        n = as_number(label)
+        if n is not None and float(n) == float(year): return i
+    return None
+
+def _float(x):
+    n = NAN if is_blank(x) else as_number(x)
+    return NAN if n is None else float(n)
+
+def sales_value_rows(rows, sheet_name, years=None):
+    # -> (names, base values, forecast values) of the sales value table's body
+    header_idx, n_body = locate_value_table(rows, sheet_name)
+    return value_table_rows(rows[header_idx], rows[header_idx + 1:header_idx + 1 + n_body], sheet_name, years)
+
+def value_table_rows(header, body, sheet_name, years=None):
+    # a located table: header cells ([label, years...]) and body rows -> (names, base, forecast)
+    base, forecast = years or (BASE_YEAR, FORECAST_YEAR)
+    labels = [str(x).strip() for x in header]
+    col_base, col_fc = year_column(labels, base), year_column(labels, forecast)
+    if col_base is None or col_fc is None:
+        raise ValueError(f"{sheet_name}: couldn't find {base}/{forecast} in {labels}")
+    bad = {"total", "type", "source", "region", "", labels[0].lower()}
+    names, v0, v1 = [], [], []
+    for row in body:
+        name = str(row[0]).strip()
+        a, b = _float(row[col_base]), _float(row[col_fc])
+        if name.lower() in bad or a != a or b != b: continue
+        names.append(name); v0.append(a); v1.append(b)
+    return names, v0, v1
+
+def series_from_rows(rows, sheet_name, years=None):
+    base, forecast = years or (BASE_YEAR, FORECAST_YEAR)
+    return series_rows(*sales_value_rows(rows, sheet_name, years), forecast - base)
+
+# ---------- LOAD ----------
+
+def forecast_columns(forecast, years=None):
+    return forecast[YEAR_COL], forecast[SALES_COL], forecast[cagr_col(years)]
+
+def headline(summary, forecast, years=None):
+    return headline_from(summary["Market Name"][SUMMARY_VALUE], *forecast_columns(forecast, years), years=years)
+
+@timed("parse")
+def parse_inputs(sheets, read_times=None, ai_ticket=None, years=None):
+    summary = sheets["Summary"]
+    breakups = {}
+    for name, rows in sheets.items():
+        if not name.startswith(BREAKUP_PREFIX): continue
+        try:
+            breakups[name] = series_from_rows(rows, name, years)
+        except ValueError:
+            if name in BREAKUP_BANDS: raise
+    return assemble(summary["Market Name"][SUMMARY_VALUE], summary["Units"][SUMMARY_VALUE],
+                    *forecast_columns(sheets["Sales_Forecast"], years), breakups, read_times, ai_ticket, years)
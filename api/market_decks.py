@@ -0,0 +1,76 @@
+import os, re, sys, json, time, zipfile, argparse, traceback
+from generate_poc import workbook_reader, build_deck, deck_bytes, as_source
+from batch import stream_decks_zip, unique_deck_name, BATCH_REPORT, BATCH_TIMEOUT_S
+import batch
+
+# ---------- MULTI-MARKET GENERATION ----------
+# One consolidated workbook -> one deck per market block (see workbook.market_prefixes).
+# The workbook is opened and every block parsed once, here; the per-market data then fans
+# out over the batch process pool, whose workers each parse the template once. A block
+# that fails to read or parse is reported in batch_report.json; the others still build.
+
+class NoMarkets(ValueError):
+    pass
+
+def load_markets(excel, years=None):
+    # -> [(market name, parsed data or {"error": traceback})], in workbook order
+    reader = workbook_reader()
+    markets = []
+    for prefix, read in reader.iter_market_blocks(as_source(excel)):
+        fallback_name = prefix.strip(" _-") or "market"
+        try:
+            data = reader.parse_inputs(read(), years=years)
+        except Exception:
+            markets.append((fallback_name, {"error": traceback.format_exc(limit=3)}))
+            continue
+        markets.append((str(data["market_name"]).strip() or fallback_name, data))
+    if not markets:
+        raise NoMarkets("No market blocks found: need Summary, Sales_Forecast and By_* sheets "
+                        "(optionally with a shared per-market prefix such as 'FC_Summary')")
+    return markets
+
+def _build_market(name, data, use_ai):
+    # runs in a batch worker; the template comes from the worker initializer
+    if "error" in data: return name, None, data["error"], 0.0
+    t0 = time.perf_counter()
+    try:
+        template = batch._worker_template
+        ppt = build_deck(data, template, use_ai=use_ai, deadline=time.monotonic() + BATCH_TIMEOUT_S)
+        return name, deck_bytes(ppt, template), None, time.perf_counter() - t0
+    except Exception:
+        return name, None, traceback.format_exc(limit=3), time.perf_counter() - t0
+
+def market_deck_name(market_name, taken):
+    return unique_deck_name(re.sub(r"[^\w\- ]+", "_", market_name).strip(" _"), taken)
+
+def stream_markets_zip(markets, template, use_ai=True, workers=None):
+    return stream_decks_zip(markets, template, _build_market, market_deck_name, "market", use_ai, workers)
+
+def generate_markets(excel, template, out, use_ai=True, workers=None):
+    with open(out, "wb") as f:
+        for chunk in stream_markets_zip(load_markets(excel), template, use_ai=use_ai, workers=workers):
+            f.write(chunk)
+
+# ---------- CLI ----------
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate one deck per market in a consolidated workbook.")
+    ap.add_argument("workbook", help="workbook with one block of sheets per market")
+    ap.add_argument("-t", "--template", default=os.path.join(os.path.dirname(__file__), "default_template.pptx"))
+    ap.add_argument("-o", "--out", default="markets.zip")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--no-ai", action="store_true", help="use the fallback paragraph instead of the AI call")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    generate_markets(args.workbook, args.template, args.out, use_ai=not args.no_ai, workers=args.workers)
+    with zipfile.ZipFile(args.out) as zf:
+        summary = json.loads(zf.read(BATCH_REPORT))
+    print(f"Markets done in {time.perf_counter() - t0:.1f}s: {summary['ok']} decks, "
+          f"{summary['failed']} failed -> {args.out}")
+    for e in summary["files"]:
+        if "error" in e: print(f"  FAILED {e['market']}: {e['error'].strip().splitlines()[-1]}")
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import os, sys, threading
+
+# ---------- RSS SAMPLING ----------
+# Peak RSS over a window (one request) is sampled from /proc/self/statm by a background
+# thread. RSS is per process, so with concurrent requests the peak includes whatever the
+# other requests held at the same time.
+
+RSS_SAMPLE_INTERVAL_S = float(os.environ.get("RSS_SAMPLE_INTERVAL_S", "0.01"))
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm", "rb") as f: return int(f.read().split()[1]) * _PAGE
+    except (OSError, ValueError, IndexError):
+        # no procfs (macOS etc.): fall back to the lifetime peak
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+class PeakRss:
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL_S):
+        self.interval = interval
+        self.start = self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def __enter__(self):
+        self.start = self.peak = rss_bytes()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+        return False
+
+    @property
+    def delta(self): return self.peak - self.start
+
+def mb(n): return f"{n / (1024 * 1024):.1f}"
@@ -0,0 +1,104 @@
+import copy, struct, weakref, zipfile, zlib
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import PACKAGE_URI, CONTENT_TYPES_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+
+# ---------- PARTIAL SAVE ----------
+# Presentation.save() re-serializes and re-deflates every part of the package, including
+# slides and media the engine never touched. save_partial() writes the same package but
+# copies each untouched part's zip entry from the template as raw, still-compressed bytes;
+# only dirty parts (edited slides, their charts and chart workbooks, presentation.xml),
+# parts that are new since the template was opened, their .rels and [Content_Types].xml
+# are serialized. Save time and memory then follow the size of the edit, not of the deck.
+# Reading Presentation.slides renames slide parts to presentation order, so each part's
+# original member name is recorded when the template is checked out (record_members) and
+# entries are copied by that name; a part's .rels is copied only if none of its targets moved.
+
+COPY_CHUNK = 1 << 20
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")   # zip local file header, as in zipfile
+
+_members = weakref.WeakKeyDictionary()   # package -> {part: member name in the template}
+
+def record_members(ppt):
+    # call before anything reads ppt.slides
+    package = ppt.part.package
+    _members[package] = {part: part.partname.membername for part in package.iter_parts()}
+
+def template_members(ppt): return _members.get(ppt.part.package)
+
+def dirty_parts(ppt, slide_indices):
+    # parts the engine may have rewritten: the given slides, the charts on them and each
+    # chart's embedded workbook, plus presentation.xml (slide list) for added slides
+    dirty = {ppt.part}
+    for i in slide_indices:
+        if i >= len(ppt.slides): continue
+        slide_part = ppt.slides[i].part
+        dirty.add(slide_part)
+        for rel in slide_part.rels.values():
+            if rel.is_external or rel.reltype != RT.CHART: continue
+            dirty.add(rel.target_part)
+            dirty.update(r.target_part for r in rel.target_part.rels.values() if not r.is_external)
+    return dirty
+
+def _raw_copy(src, info, dst, name):
+    # appends src's entry to dst under `name` without inflating/deflating it
+    src.fp.seek(info.header_offset)
+    fields = _LOCAL_HEADER.unpack(src.fp.read(_LOCAL_HEADER.size))
+    src.fp.seek(info.header_offset + _LOCAL_HEADER.size + fields[-2] + fields[-1])
+    zinfo = copy.copy(info)
+    zinfo.filename = zinfo.orig_filename = name
+    zinfo.flag_bits &= ~0x08   # sizes and CRC go in the local header: no data descriptor
+    zinfo.extra = b""
+    zinfo.header_offset = dst.fp.tell()
+    dst.fp.write(zinfo.FileHeader())
+    remaining = info.compress_size
+    while remaining:
+        chunk = src.fp.read(min(COPY_CHUNK, remaining))
+        if not chunk: raise zipfile.BadZipFile(f"truncated entry {info.filename}")
+        dst.fp.write(chunk); remaining -= len(chunk)
+    dst.filelist.append(zinfo)
+    dst.NameToInfo[zinfo.filename] = zinfo
+    dst.start_dir = dst.fp.tell()
+    dst._didModify = True
+
+def _unchanged(part, info):
+    # XML parts are edited through dirty_parts(); binary parts are checked against the
+    # template entry's size and CRC-32, which needs no inflating
+    if info is None: return False
+    if hasattr(part, "_element"): return True
+    blob = part.blob
+    return info.file_size == len(blob) and info.CRC == zlib.crc32(blob)
+
+def _rels_unmoved(part, members):
+    return all(rel.is_external or members.get(rel.target_part) == rel.target_part.partname.membername
+               for rel in part.rels.values())
+
+# template: the package the Presentation was opened from (path or seekable file object);
+# ppt must have been recorded with record_members()
+def save_partial(ppt, template, out, dirty):
+    package = ppt.part.package
+    members = template_members(ppt)
+    if members is None: raise ValueError("save_partial needs the template's member names (record_members)")
+    parts = tuple(package.iter_parts())
+    with zipfile.ZipFile(template) as src, zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as dst:
+        entries = {info.filename: info for info in src.infolist()}
+        dst.writestr(CONTENT_TYPES_URI.membername, serialize_part_xml(_ContentTypesItem.xml_for(parts)))
+        dst.writestr(PACKAGE_URI.rels_uri.membername, package._rels.xml)
+        copied = written = 0
+        for part in parts:
+            name, rels_name = part.partname.membername, part.partname.rels_uri.membername
+            original = members.get(part)
+            info = entries.get(original) if original else None
+            if part not in dirty and _unchanged(part, info):
+                _raw_copy(src, info, dst, name); copied += 1
+                if part._rels:
+                    original_rels = PackURI("/" + original).rels_uri.membername
+                    if original_rels in entries and _rels_unmoved(part, members):
+                        _raw_copy(src, entries[original_rels], dst, rels_name)
+                    else:
+                        dst.writestr(rels_name, part.rels.xml)
+            else:
+                dst.writestr(name, part.blob); written += 1
+                if part._rels: dst.writestr(rels_name, part.rels.xml)
+    return copied, written
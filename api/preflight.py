@@ -0,0 +1,136 @@
+from deck_inputs import DEFAULT_YEARS, BREAKUP_BANDS, SUMMARY_VALUE, YEAR_COL, SALES_COL, cagr_col
+from lean_reader import open_workbook, cell_value, cell_text, as_number, year_column
+from columnar_inputs import input_kind, open_tables
+
+# ---------- PREFLIGHT VALIDATION ----------
+# Checks a workbook for what parse_inputs() will need before any deck work starts: the
+# required sheets, the Summary rows, the Sales_Forecast columns and year rows, and each
+# breakup sheet's "Sales Value" title and year columns. Sheets are streamed read-only and
+# each check stops at the first rows that satisfy it, so a typical workbook is answered
+# in milliseconds. Legacy .xls files (not zip packages) are left to the pandas reader.
+# JSON documents and table bundles (columnar_inputs.py) get the same checks on their tables.
+
+SUMMARY_KEYS = ("Market Name", "Units")
+
+class WorkbookInvalid(ValueError):
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__("; ".join(p["message"] for p in problems))
+
+def problem(sheet, code, message):
+    return {"sheet": sheet, "code": code, "message": message}
+
+def _rows(ws):
+    ws.reset_dimensions()
+    for row in ws.rows:
+        yield [cell_value(c) for c in row]
+
+# The checks take iterables, so on a sheet they consume streamed rows only as far as needed.
+
+def summary_problems(labels):
+    missing = set(SUMMARY_KEYS)
+    for label in labels:
+        missing.discard(label)
+        if not missing: break
+    return [problem("Summary", "missing_row", f"Summary: no '{key}' row") for key in SUMMARY_KEYS if key in missing]
+
+def forecast_problems(header, year_values, years=None):
+    missing = [c for c in (YEAR_COL, SALES_COL, cagr_col(years)) if c not in header]
+    if missing:
+        return [problem("Sales_Forecast", "missing_column", f"Sales_Forecast: no '{c}' column") for c in missing]
+    missing_years = set(years or DEFAULT_YEARS)
+    for value in year_values:
+        missing_years.discard(as_number(value))
+        if not missing_years: return []
+    return [problem("Sales_Forecast", "missing_year_row", f"Sales_Forecast: no {y} row") for y in sorted(missing_years)]
+
+def year_column_problems(sheet, labels, years=None):
+    labels = [str(x).strip() for x in labels]
+    return [problem(sheet, "missing_year_column", f"{sheet}: no {year} column in the Sales Value table")
+            for year in (years or DEFAULT_YEARS) if year_column(labels, year) is None]
+
+def check_summary(ws):
+    rows = _rows(ws)
+    header = next(rows, [])
+    out = []
+    if SUMMARY_VALUE not in header[1:]:
+        out.append(problem("Summary", "missing_column", f"Summary: no '{SUMMARY_VALUE}' column header"))
+    return out + summary_problems(row[0] for row in rows if row)
+
+def check_forecast(ws, years=None):
+    rows = _rows(ws)
+    header = next(rows, [])
+    col = header.index(YEAR_COL) if YEAR_COL in header else 0
+    return forecast_problems(header, (row[col] for row in rows if col < len(row)), years)
+
+def check_breakup(ws, sheet, years=None):
+    # the title row, then its header row, as sales_value_table_from_raw locates them
+    rows = _rows(ws)
+    for row in rows:
+        text = cell_text(row[0]) if row else ""
+        if "market breakup" in text and "sales value" in text: break
+    else:
+        return [problem(sheet, "missing_title", f"{sheet}: no 'Market Breakup ... Sales Value' title")]
+    labels = next(rows, [])
+    if not labels:
+        return [problem(sheet, "missing_title", f"{sheet}: no header row after the 'Sales Value' title")]
+    return year_column_problems(sheet, labels, years)
+
+def validate_tables(src, years=None):
+    # a JSON document or table bundle: tables are parsed whole, only the ones checked
+    try:
+        with open_tables(src) as tables:
+            out = [problem(s, "missing_sheet", f"Missing table '{s}'")
+                   for s in ("Summary", "Sales_Forecast", *BREAKUP_BANDS) if s not in tables]
+            if "Summary" in tables: out += summary_problems(tables["Summary"]())
+            if "Sales_Forecast" in tables:
+                forecast = tables["Sales_Forecast"]()
+                out += forecast_problems(list(forecast), forecast.get(YEAR_COL, []), years)
+            for sheet in BREAKUP_BANDS:
+                if sheet in tables: out += year_column_problems(sheet, list(tables[sheet]()), years)
+            return out
+    except Exception as e:
+        return [problem(None, "unreadable", f"Could not read inputs: {e}")]
+
+XLSX_MAGIC, XLS_MAGIC = b"PK\x03\x04", b"\xd0\xcf\x11\xe0"   # zip package / OLE2 compound file
+
+def _magic(src):
+    if isinstance(src, str):
+        with open(src, "rb") as f: return f.read(4)
+    pos = src.tell(); src.seek(0)
+    try: return src.read(4)
+    finally: src.seek(pos)
+
+def validate_workbook(src, years=None):
+    # -> list of problems ({"sheet", "code", "message"}); empty when the workbook looks usable.
+    # A file object is read from the start and left where it was. years: (base, forecast)
+    if input_kind(src): return validate_tables(src, years)
+    magic = _magic(src)
+    if magic == XLS_MAGIC: return []
+    if magic != XLSX_MAGIC:
+        return [problem(None, "unreadable", "Not an Excel workbook (.xlsx or .xls), JSON document or table bundle")]
+    pos = None if isinstance(src, str) else src.tell()
+    try:
+        if pos is not None: src.seek(0)
+        try:
+            wb = open_workbook(src)
+        except Exception as e:
+            return [problem(None, "unreadable", f"Could not open workbook: {e}")]
+        try:
+            names = set(wb.sheetnames)
+            missing = [s for s in ("Summary", "Sales_Forecast", *BREAKUP_BANDS) if s not in names]
+            out = [problem(s, "missing_sheet", f"Missing sheet '{s}'") for s in missing]
+            if "Summary" in names: out += check_summary(wb["Summary"])
+            if "Sales_Forecast" in names: out += check_forecast(wb["Sales_Forecast"], years)
+            for sheet in BREAKUP_BANDS:
+                if sheet in names: out += check_breakup(wb[sheet], sheet, years)
+            return out
+        finally:
+            wb.close()
+    finally:
+        if pos is not None: src.seek(pos)
+
+def check_workbook(src, years=None):
+    # raises WorkbookInvalid listing every problem found
+    problems = validate_workbook(src, years)
+    if problems: raise WorkbookInvalid(problems)
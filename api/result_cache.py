@@ -0,0 +1,154 @@
+import io, os, time, hashlib, tempfile, threading
+from concurrent.futures import Future
+
+# ---------- RESULT CACHE ----------
+# Finished decks are stored on local disk under a content address:
+#   sha256(excel bytes, template bytes, generator version, AI setting)
+# so a re-submitted upload is answered from disk without touching pandas or python-pptx.
+# Entries expire RESULT_CACHE_TTL_S after they were written; when the directory grows
+# past RESULT_CACHE_MAX_BYTES the least recently used files are removed (last use is
+# kept in the file's atime, set explicitly on every hit). Concurrent requests for the
+# same key are coalesced: one generates, the others wait for its file. A deck its producer
+# marks as not cacheable (produce returns False) is served to them from memory and dropped.
+
+RESULT_CACHE_DIR       = os.environ.get("RESULT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "imarc_results"))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+RESULT_CACHE_TTL_S     = int(os.environ.get("RESULT_CACHE_TTL_S", str(24 * 3600)))
+ENTRY_SUFFIX = ".pptx"
+
+from deck_inputs import DEFAULT_YEARS
+
+# modules whose code determines the output; their contents (and the configured years) version the cache
+ENGINE_FILES = ("generate_poc.py", "workbook.py", "deck_inputs.py", "frame_parser.py", "lean_reader.py",
+                "columnar_inputs.py", "table_writer.py", "fill_plan.py", "ai_paragraph.py", "partial_save.py")
+
+def engine_version(files=ENGINE_FILES, base=os.path.dirname(__file__)):
+    h = hashlib.sha256()
+    for name in files:
+        try:
+            with open(os.path.join(base, name), "rb") as f: h.update(f.read())
+        except OSError:
+            h.update(name.encode())
+    h.update(repr(DEFAULT_YEARS).encode())
+    return h.hexdigest()[:16]
+
+GENERATOR_VERSION = engine_version()
+
+def result_key(excel_digest, template_digest, ai_setting, version=GENERATOR_VERSION):
+    h = hashlib.sha256()
+    for part in (excel_digest, template_digest, version, str(ai_setting)):
+        h.update(part.encode()); h.update(b"\0")
+    return h.hexdigest()
+
+def buffer_digest(stream):
+    # hashes an in-memory upload without copying it
+    if hasattr(stream, "getbuffer"): return hashlib.sha256(stream.getbuffer()).hexdigest()
+    pos = stream.tell(); stream.seek(0)
+    h = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(1 << 20), b""): h.update(chunk)
+    stream.seek(pos)
+    return h.hexdigest()
+
+class ResultCache:
+    def __init__(self, root=RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_MAX_BYTES, ttl_s=RESULT_CACHE_TTL_S):
+        self.root      = root
+        self.max_bytes = max_bytes
+        self.ttl_s     = ttl_s
+        self._inflight = {}
+        self._lock     = threading.Lock()
+        self.hits = self.misses = self.coalesced = self.evictions = 0
+        if self.enabled: os.makedirs(root, exist_ok=True)
+
+    @property
+    def enabled(self): return self.max_bytes > 0
+
+    def path_for(self, key): return os.path.join(self.root, key + ENTRY_SUFFIX)
+
+    def lookup(self, key):
+        path = self.path_for(key)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        now = time.time()
+        if now - st.st_mtime > self.ttl_s:
+            self._remove(path); return None
+        try: os.utime(path, (now, st.st_mtime))   # atime = last use
+        except OSError: pass
+        return path
+
+    # produce(file_obj) writes the deck and may return False to keep it out of the cache;
+    # returns (path or in-memory file, "hit" | "miss" | "coalesced" | "uncached")
+    def get_or_create(self, key, produce, wait_timeout=None):
+        path = self.lookup(key)
+        if path:
+            with self._lock: self.hits += 1
+            return path, "hit"
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            result = fut.result(timeout=wait_timeout)
+            return (io.BytesIO(result) if isinstance(result, bytes) else result), "coalesced"
+
+        final = self.path_for(key)
+        tmp = f"{final}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f: keep = produce(f)
+            if keep is False:
+                with open(tmp, "rb") as f: data = f.read()
+                self._remove(tmp)
+                fut.set_result(data)
+                return io.BytesIO(data), "uncached"
+            os.replace(tmp, final)
+            fut.set_result(final)
+        except BaseException as e:
+            self._remove(tmp)
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock: self._inflight.pop(key, None)
+        self.evict()
+        return final, "miss"
+
+    def _remove(self, path):
+        try: os.remove(path); return True
+        except OSError: return False
+
+    def _entries(self):
+        out = []
+        try:
+            with os.scandir(self.root) as it:
+                for e in it:
+                    if e.name.endswith(ENTRY_SUFFIX):
+                        try: out.append((e.path, e.stat()))
+                        except OSError: pass
+        except OSError:
+            pass
+        return out
+
+    def evict(self):
+        now = time.time()
+        live, total = [], 0
+        for path, st in self._entries():
+            if now - st.st_mtime > self.ttl_s:
+                if self._remove(path): self.evictions += 1
+                continue
+            live.append((st.st_atime, st.st_size, path)); total += st.st_size
+        for _, size, path in sorted(live):
+            if total <= self.max_bytes: break
+            if self._remove(path): self.evictions += 1; total -= size
+
+    def stats(self):
+        entries = self._entries()
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced,
+                "evictions": self.evictions, "entries": len(entries),
+                "bytes": sum(st.st_size for _, st in entries), "max_bytes": self.max_bytes,
+                "version": GENERATOR_VERSION}
+
+result_cache = ResultCache()
@@ -0,0 +1,117 @@
+import re
+from copy import deepcopy
+from pptx.util import Pt
+from pptx.enum.text import PP_ALIGN
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+
+# ---------- BULK TABLE WRITER ----------
+# Writes all body rows of a table in one pass at the XML level. Each column gets a
+# pre-styled paragraph/run prototype (alignment + font size already applied), so the
+# per-cell work is a deepcopy and a text assignment instead of python-pptx proxies plus
+# a second styling walk over every cell, paragraph and run. The produced XML is the
+# same as setting T.cell(r, c).text and then styling the cell with python-pptx.
+
+_CTRL_CHARS = re.compile(r"([\x00-\x08\x0B-\x1F])")
+_TXBODY, _BODYPR, _P, _T = qn("a:txBody"), qn("a:bodyPr"), qn("a:p"), qn("a:t")
+
+def escape_ctrl_chars(s):
+    # same escaping python-pptx applies to run text (tab and line-feed are kept)
+    return _CTRL_CHARS.sub(lambda m: "_x%04X_" % ord(m.group(1)), s)
+
+def column_alignment(c): return PP_ALIGN.LEFT if c <= 1 else PP_ALIGN.RIGHT
+
+def _prototypes(n_cols, font_size, align_for):
+    # per column: (empty styled <a:p>, styled <a:r>)
+    protos = []
+    for c in range(n_cols):
+        p = parse_xml("<a:p %s/>" % nsdecls("a"))
+        p.get_or_add_pPr().algn = align_for(c)
+        r = p.add_r("x")
+        r.get_or_add_rPr().sz = font_size.centipoints
+        p.remove(r)
+        protos.append((p, r))
+    return protos
+
+# hot path: plain lxml calls rather than python-pptx's descriptor-based accessors
+def _set_cell_text(tc, text, proto_p, proto_r):
+    txBody = tc.find(_TXBODY)
+    if txBody is None: txBody = tc.get_or_add_txBody()
+    for p in txBody.findall(_P): txBody.remove(p)
+    txBody.find(_BODYPR).set("wrap", "none")
+    for p_text in text.split("\n"):
+        p = deepcopy(proto_p)
+        for idx, r_str in enumerate(p_text.split("\v")):
+            if idx > 0: p.add_br()
+            if r_str:
+                r = deepcopy(proto_r)
+                r[-1].text = escape_ctrl_chars(r_str) if _CTRL_CHARS.search(r_str) else r_str   # <a:t>
+                p.append(r)
+        txBody.append(p)
+
+def _style_cell(tc, c, font_size, align_for):
+    txBody = tc.get_or_add_txBody()
+    txBody.bodyPr.wrap = "none"
+    for p in txBody.p_lst:
+        p.get_or_add_pPr().algn = align_for(c)
+        for r in p.r_lst: r.get_or_add_rPr().sz = font_size.centipoints
+
+def sync_frame_height(T):
+    # what _Row.height does via Table.notify_height_changed, in one pass over tr_lst
+    # (indexing T.rows re-lists every row, which makes that quadratic on tall tables)
+    T._graphic_frame.height = sum(tr.h for tr in T._tbl.tr_lst)
+
+def _write_row(tr, vals, body_height, protos, n_cols, font_size, align_for):
+    tr.h = body_height
+    tcs = tr.tc_lst
+    n_vals = min(len(vals), n_cols)
+    for c in range(n_cols):
+        if c < n_vals:
+            _set_cell_text(tcs[c], str(vals[c]), *protos[c])
+        else:
+            _style_cell(tcs[c], c, font_size, align_for)
+
+def write_table_body(T, rows, body_height, font_size=Pt(9), align_for=column_alignment):
+    # rows: sequences of cell values; body rows are added by copying the table's last row
+    tbl = T._tbl
+    n_cols = len(T.columns)
+    tr_lst = tbl.tr_lst
+    have = len(tr_lst) - 1
+    protos = _prototypes(n_cols, font_size, align_for)
+
+    # pre-styled row prototype: the last template row (snapshotted before any text is
+    # written into it) with one styled run per written column, so each new row is a
+    # single deepcopy plus <a:t> text swaps
+    template_tr = proto_tr = None
+    if len(rows) > have:
+        template_tr = deepcopy(tr_lst[-1])
+        proto_n = min(len(rows[-1]), n_cols)
+        proto_tr = deepcopy(template_tr)
+        _write_row(proto_tr, ["x"] * proto_n, body_height, protos, n_cols, font_size, align_for)
+
+    for r_idx, vals in enumerate(rows, start=1):
+        if r_idx <= have:
+            _write_row(tr_lst[r_idx], vals, body_height, protos, n_cols, font_size, align_for)
+            continue
+        texts = [str(v) for v in vals[:n_cols]]
+        if len(texts) == proto_n and all(t and "\n" not in t and "\v" not in t for t in texts):
+            tr = deepcopy(proto_tr)
+            for t_el, text in zip(tr.iter(_T), texts):
+                t_el.text = escape_ctrl_chars(text) if _CTRL_CHARS.search(text) else text
+        else:
+            # empty cells and multi-line text take the general per-cell path
+            tr = deepcopy(template_tr)
+            _write_row(tr, vals, body_height, protos, n_cols, font_size, align_for)
+        tbl.append(tr)
+    sync_frame_height(T)
+
+def style_table_rows(T, row_indices, heights, font_size=Pt(9), align_for=column_alignment):
+    # styling for rows the writer did not produce (header, untouched template rows)
+    tr_lst = T._tbl.tr_lst
+    n_cols = len(T.columns)
+    for r in row_indices:
+        tr = tr_lst[r]
+        tr.h = heights(r)
+        tcs = tr.tc_lst
+        for c in range(n_cols): _style_cell(tcs[c], c, font_size, align_for)
+    sync_frame_height(T)
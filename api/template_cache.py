@@ -0,0 +1,95 @@
+import io, os, hashlib, threading
+from copy import deepcopy
+from collections import OrderedDict
+from pptx import Presentation
+from partial_save import record_members
+
+# ---------- TEMPLATE CACHE ----------
+# Parsed templates are kept in memory keyed by the SHA-256 of their bytes. Each caller
+# gets a deepcopy of the cached Presentation: the XML trees are copied but media blobs
+# (immutable bytes) are shared, so a clone is much cheaper than unzipping and
+# re-parsing the whole package. Uploaded templates go through the same cache.
+# Clones have their template member names recorded for save_partial().
+
+TEMPLATE_CACHE_MAX_ENTRIES = int(os.environ.get("TEMPLATE_CACHE_MAX_ENTRIES", "8"))
+TEMPLATE_CACHE_MAX_BYTES   = int(os.environ.get("TEMPLATE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# parsed lxml trees take a few times the size of the compressed package
+PARSED_SIZE_FACTOR = 4
+
+def content_hash(data): return hashlib.sha256(data).hexdigest()
+
+class TemplateCache:
+    def __init__(self, max_entries=TEMPLATE_CACHE_MAX_ENTRIES, max_bytes=TEMPLATE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self._entries    = OrderedDict()   # key -> (Presentation, estimated bytes)
+        self._path_keys  = {}              # (path, mtime, size) -> key, avoids re-hashing the default template
+        self._lock       = threading.Lock()
+        self.hits = self.misses = 0
+
+    @property
+    def size_bytes(self): return sum(cost for _, cost in self._entries.values())
+
+    def _read(self, src):
+        # returns (key, bytes or None); bytes are None when the key came from the path memo
+        if isinstance(src, (bytes, bytearray, memoryview)):
+            data = bytes(src); return content_hash(data), data
+        if hasattr(src, "read"):
+            data = src.read(); return content_hash(data), data
+        st = os.stat(src)
+        stamp = (os.path.abspath(src), st.st_mtime_ns, st.st_size)
+        key = self._path_keys.get(stamp)
+        if key is not None: return key, None
+        with open(src, "rb") as f: data = f.read()
+        key = content_hash(data)
+        self._path_keys[stamp] = key
+        return key, data
+
+    def key_for(self, src): return self._read(src)[0]
+
+    def get(self, src): return self.checkout(src)[0]
+
+    # returns (isolated Presentation, template content hash)
+    def checkout(self, src):
+        key, data = self._read(src)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            # the master is only read, so concurrent requests clone it outside the lock
+            clone = deepcopy(entry[0])
+            record_members(clone)
+            return clone, key
+        if data is None:
+            with open(src, "rb") as f: data = f.read()
+        master = Presentation(io.BytesIO(data))
+        clone  = deepcopy(master)
+        record_members(clone)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (master, len(data) * PARSED_SIZE_FACTOR)
+            self._entries.move_to_end(key)
+            self._evict()
+        return clone, key
+
+    def _evict(self):
+        # never evicts the entry that was just inserted, even if it alone exceeds the cap
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes):
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear(); self._path_keys.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        return {"entries": len(self._entries), "bytes": self.size_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+template_cache = TemplateCache()
+
+def open_template(src): return template_cache.get(src)
+
+def checkout_template(src): return template_cache.checkout(src)
@@ -0,0 +1,162 @@
+import os, json, time, logging, threading, cProfile
+from contextvars import ContextVar
+from functools import wraps
+
+from memstat import mb
+
+# ---------- STAGE TIMING ----------
+# span("name") times a block into the timeline of the current request (a ContextVar, so
+# it follows the request into pool threads submitted with copy_context().run). Repeated
+# spans with the same name add up. With TIMING=0, or outside a timeline, span() returns a
+# shared no-op and costs one ContextVar lookup.
+# Finished timelines feed per-stage latency histograms, rendered in Prometheus text format.
+
+TIMING_ENABLED = os.environ.get("TIMING", "1") != "0"
+PROFILE_DIR    = os.environ.get("PROFILE_DIR", "")   # set to allow ?profile=1 dumps there
+
+# histogram bucket upper bounds, seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_timeline = ContextVar("timeline", default=None)
+
+class Timeline:
+    def __init__(self):
+        self.spans = {}   # name -> [seconds, count], in first-use order
+        self.fields = {}  # extra event-line fields set with note()
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            entry = self.spans.get(name)
+            if entry is None: self.spans[name] = [seconds, 1]
+            else: entry[0] += seconds; entry[1] += 1
+
+    @property
+    def total(self): return time.perf_counter() - self.start
+
+    def as_ms(self): return {name: round(secs * 1000, 2) for name, (secs, _) in self.spans.items()}
+
+    def server_timing(self):
+        parts = [f"{name};dur={secs * 1000:.1f}" for name, (secs, _) in self.spans.items()]
+        return ", ".join(parts + [f"total;dur={self.total * 1000:.1f}"])
+
+class _Span:
+    __slots__ = ("timeline", "name", "t0")
+
+    def __init__(self, timeline, name):
+        self.timeline, self.name = timeline, name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timeline.add(self.name, time.perf_counter() - self.t0)
+        return False
+
+class _NoSpan:
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+_NO_SPAN = _NoSpan()
+
+def span(name):
+    timeline = _timeline.get()
+    return _NO_SPAN if timeline is None else _Span(timeline, name)
+
+def timed(name):
+    # decorator form of span() for helpers called from several places
+    def wrap(fn):
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            timeline = _timeline.get()
+            if timeline is None: return fn(*args, **kwargs)
+            with _Span(timeline, name): return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+def start_timeline():
+    # returns the new Timeline (None when timing is disabled)
+    if not TIMING_ENABLED: return None
+    timeline = Timeline()
+    _timeline.set(timeline)
+    return timeline
+
+def end_timeline(timeline):
+    if timeline is None: return
+    _timeline.set(None)
+    for name, (secs, _) in timeline.spans.items(): stage_latency.observe(name, secs)
+    stage_latency.observe("total", timeline.total)
+
+def note(**fields):
+    # adds fields (e.g. the cache outcome) to the current timeline's event line
+    timeline = _timeline.get()
+    if timeline is not None: timeline.fields.update(fields)
+
+def format_timeline(timeline):
+    return ", ".join(f"{name} {ms:.0f} ms" for name, ms in timeline.as_ms().items()) if timeline else ""
+
+# ---------- EVENT LOG ----------
+# one JSON line per generation (cache outcome, peak RSS, stage times) on stderr. app.logger
+# stays at WARNING outside debug mode, so these go through their own logger.
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+log = logging.getLogger("imarc.generate")
+if not log.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_handler)
+log.setLevel(LOG_LEVEL)
+log.propagate = False
+
+def log_event(event, timeline=None, rss=None, **fields):
+    line = {"event": event, **(timeline.fields if timeline else {}), **fields}
+    if rss is not None: line.update(peak_rss_mb=float(mb(rss.peak)), rss_delta_mb=float(mb(rss.delta)))
+    line.update(total_ms=round(timeline.total * 1000, 1) if timeline else None,
+                stages_ms=timeline.as_ms() if timeline else None)
+    log.info(json.dumps(line))
+
+# ---------- HISTOGRAMS ----------
+
+class Histograms:
+    def __init__(self, metric, help_text, buckets=BUCKETS):
+        self.metric, self.help_text, self.buckets = metric, help_text, buckets
+        self._series = {}   # label -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, label, seconds):
+        with self._lock:
+            row = self._series.get(label)
+            if row is None: row = self._series[label] = [0] * (len(self.buckets) + 2) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound: row[i] += 1
+            row[-3] += 1; row[-2] += 1; row[-1] += seconds   # +Inf bucket, count, sum
+
+    def render(self, label_name="stage"):
+        lines = [f"# HELP {self.metric} {self.help_text}", f"# TYPE {self.metric} histogram"]
+        with self._lock:
+            for label, row in sorted(self._series.items()):
+                sel = f'{label_name}="{label}"'
+                for bound, n in zip(self.buckets, row):
+                    lines.append(f'{self.metric}_bucket{{{sel},le="{bound}"}} {n}')
+                lines.append(f'{self.metric}_bucket{{{sel},le="+Inf"}} {row[-3]}')
+                lines.append(f"{self.metric}_count{{{sel}}} {row[-2]}")
+                lines.append(f"{self.metric}_sum{{{sel}}} {row[-1]:.6f}")
+        return "\n".join(lines) + "\n"
+
+stage_latency = Histograms("deck_stage_seconds", "Time spent per generation stage")
+
+# ---------- PROFILING ----------
+
+def profile_path(tag):
+    return os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{tag}.prof")
+
+def run_profiled(path, fn, *args, **kwargs):
+    # cProfile only sees the calling thread, so this wraps the function run in the worker
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args, **kwargs)
+    finally:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        profiler.dump_stats(path)
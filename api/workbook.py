@@ -0,0 +1,78 @@
+import time
+from functools import partial
+
+# ---------- SINGLE-PASS WORKBOOK LOADER ----------
+# The xlsx is opened (unzipped, shared strings parsed) once; every sheet is then
+# streamed from that one openpyxl read-only workbook instead of re-opening the file
+# per pd.read_excel call.
+
+# sheet name -> pd.read_excel kwargs
+WORKBOOK_SHEETS = {
+    "Summary":        {"index_col": 0},
+    "Sales_Forecast": {},
+    "By_Type":        {"header": None},
+    "By_Source":      {"header": None},
+    "By_Region":      {"header": None},
+}
+BREAKUP_PREFIX = "By_"   # any further By_* sheet is read like the ones above
+
+def workbook_sheets(sheet_names, prefix=""):
+    # sheet name in the workbook -> (name without prefix, read kwargs): the fixed sheets,
+    # then every other <prefix>By_* sheet in workbook order
+    sheets = {prefix + name: (name, kwargs) for name, kwargs in WORKBOOK_SHEETS.items()}
+    for name in sheet_names:
+        if name.startswith(prefix + BREAKUP_PREFIX) and name not in sheets:
+            sheets[name] = (name[len(prefix):], {"header": None})
+    return sheets
+
+def open_workbook(src):
+    # pandas picks openpyxl (read_only, data_only) for .xlsx and its xls engine for legacy files;
+    # imported here so the lean reader can use the sheet tables without loading pandas
+    import pandas as pd
+    return pd.ExcelFile(src)
+
+def iter_sheets(src, sheets=None):
+    # yields (sheet, DataFrame, seconds) in `sheets` order so callers can act on early sheets;
+    # the first item is ("<open>", None, seconds) for the one-off open/parse cost.
+    # sheets=None reads WORKBOOK_SHEETS plus any other By_* sheet the workbook has.
+    t0 = time.perf_counter()
+    with open_workbook(src) as xl:
+        yield "<open>", None, time.perf_counter() - t0
+        if sheets is None:
+            sheets = {name: kwargs for name, (_, kwargs) in workbook_sheets(xl.sheet_names).items()}
+        for name, kwargs in sheets.items():
+            t0 = time.perf_counter()
+            frame = xl.parse(name, **kwargs)
+            yield name, frame, time.perf_counter() - t0
+
+def load_sheets(src, sheets=None):
+    # returns ({sheet: DataFrame}, {sheet: seconds})
+    frames, timings = {}, {}
+    for name, frame, seconds in iter_sheets(src, sheets):
+        if frame is not None: frames[name] = frame
+        timings[name] = seconds
+    return frames, timings
+
+# ---------- MULTI-MARKET WORKBOOKS ----------
+# A consolidated workbook holds one block of WORKBOOK_SHEETS per market, told apart by a
+# sheet-name prefix ("FC_Summary", "FC_Sales_Forecast", "FC_By_Type", ...). A plain
+# single-market workbook is the block with the empty prefix.
+
+def market_prefixes(sheet_names):
+    names = set(sheet_names)
+    anchor = next(iter(WORKBOOK_SHEETS))
+    prefixes = [n[:len(n) - len(anchor)] for n in sheet_names if n.endswith(anchor)]
+    return [p for p in prefixes if all(p + sheet in names for sheet in WORKBOOK_SHEETS)]
+
+def _read_block(xl, prefix):
+    return {name: xl.parse(sheet, **kwargs) for sheet, (name, kwargs) in workbook_sheets(xl.sheet_names, prefix).items()}
+
+def iter_market_blocks(src):
+    # opens the workbook once -> (prefix, read), in workbook order; read() -> {sheet: DataFrame}
+    # while the generator is open, so a bad block fails on its own
+    with open_workbook(src) as xl:
+        for prefix in market_prefixes(xl.sheet_names):
+            yield prefix, partial(_read_block, xl, prefix)
+
+def format_timings(timings):
+    return ", ".join(f"{k}={v * 1000:.1f}ms" for k, v in timings.items())
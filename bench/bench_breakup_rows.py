@@ -0,0 +1,37 @@
+# Micro-benchmark: vectorized series_from_sheet vs the original iterrows() path.
+#   python bench/bench_breakup_rows.py [rows ...]
+import os, sys, timeit
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+from frame_parser import series_from_sheet
+from deck_inputs import musd, cagr, fmt_pct
+
+def series_from_sheet_rowwise(df):
+    # the pre-vectorization implementation, kept as the reference
+    name_col = df.columns[0]
+    out = []
+    for _, row in df.iterrows():
+        name = str(row[name_col]).strip()
+        v24 = row[2024]; v33 = row[2033]
+        out.append((name, musd(v24), musd(v33), fmt_pct(cagr(v24, v33, 9))))
+    return out
+
+def breakup_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    v24 = rng.uniform(-50, 5000, n_rows); v33 = rng.uniform(-50, 9000, n_rows)
+    v24[::11] = 0.0; v33[::13] = np.nan; v24[::17] = np.nan   # zeros, blanks, negatives
+    return pd.DataFrame({"Region": [f" Segment {i} " for i in range(n_rows)], 2024: v24, 2033: v33})
+
+def main(sizes):
+    for n in sizes:
+        df = breakup_frame(n)
+        assert series_from_sheet(df) == series_from_sheet_rowwise(df), f"output mismatch at {n} rows"
+        reps = max(1, 2000 // n)
+        t_row = min(timeit.repeat(lambda: series_from_sheet_rowwise(df), number=reps, repeat=3)) / reps
+        t_vec = min(timeit.repeat(lambda: series_from_sheet(df), number=reps, repeat=3)) / reps
+        print(f"{n:>7} rows  rowwise {t_row * 1000:9.2f} ms  vectorized {t_vec * 1000:8.2f} ms  x{t_row / t_vec:6.1f}")
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10, 100, 1000, 10000])
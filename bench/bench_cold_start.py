@@ -0,0 +1,96 @@
+# Benchmark: serverless cold start per workbook reader (WORKBOOK_READER=pandas|openpyxl).
+#   python bench/bench_cold_start.py [--repeat 5] [--save-baseline]
+# Each run is a fresh interpreter that imports api/index.py and serves one request: the
+# median import time, RSS after import, first-request time and RSS after it are compared
+# with bench/cold_start_baseline.json (exit 1 when slower/larger than baseline * (1 +
+# tolerance) + slack). Also lists the heavy modules each mode loaded at import.
+import os, sys, json, argparse, tempfile, statistics, subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.join(BENCH_DIR, "..", "api")
+sys.path.insert(0, API_DIR)
+from synth import write_inputs
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "cold_start_baseline.json")
+READERS = ("pandas", "openpyxl")
+METRICS = ("import_ms", "import_rss_mb", "first_request_ms", "request_rss_mb")
+HEAVY = ("pandas", "numpy", "openpyxl", "pptx", "lxml", "PIL", "google.generativeai")
+
+CHILD = r"""
+import io, sys, json, time
+t0 = time.perf_counter()
+import index
+t1 = time.perf_counter()
+from memstat import rss_bytes
+mb = lambda n: n / (1024 * 1024)
+rss_import = rss_bytes()
+loaded = [m for m in HEAVY if m in sys.modules]
+with open(EXCEL, "rb") as f: excel = f.read()
+with open(TEMPLATE, "rb") as f: template = f.read()
+t2 = time.perf_counter()
+r = index.app.test_client().post("/", data={"excel": (io.BytesIO(excel), "datasheet_imarc.xlsx"),
+                                            "template": (io.BytesIO(template), "template.pptx")},
+                                 content_type="multipart/form-data")
+t3 = time.perf_counter()
+assert r.status_code == 200, r.status_code
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "import_rss_mb": mb(rss_import),
+                  "first_request_ms": (t3 - t2) * 1000, "request_rss_mb": mb(rss_bytes()), "loaded": loaded}))
+"""
+
+def cold_start(reader, excel, template):
+    env = dict(os.environ, WORKBOOK_READER=reader, AI_PROVIDER="off", RESULT_CACHE_MAX_BYTES="0")
+    code = f"HEAVY, EXCEL, TEMPLATE = {HEAVY!r}, {excel!r}, {template!r}\n" + CHILD
+    out = subprocess.run([sys.executable, "-c", code], cwd=API_DIR, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def bench_reader(reader, excel, template, repeat):
+    runs = [cold_start(reader, excel, template) for _ in range(repeat)]
+    result = {m: statistics.median(r[m] for r in runs) for m in METRICS}
+    result["loaded"] = runs[-1]["loaded"]
+    return result
+
+def compare(results, baseline, tolerance, slack):
+    regressions = []
+    for reader, metrics in results.items():
+        base = baseline.get(reader, {})
+        for m in METRICS:
+            if m in base and metrics[m] > base[m] * (1 + tolerance) + slack:
+                regressions.append(f"{reader} {m}: {metrics[m]:.1f} vs baseline {base[m]:.1f}")
+    return regressions
+
+def main():
+    ap = argparse.ArgumentParser(description="Cold-start import time and memory per workbook reader")
+    ap.add_argument("--readers", nargs="+", default=list(READERS))
+    ap.add_argument("--rows", type=int, default=50, help="body rows per breakup sheet")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--baseline", default=BASELINE_PATH)
+    ap.add_argument("--tolerance", type=float, default=0.3, help="allowed increase as a fraction")
+    ap.add_argument("--slack", type=float, default=20.0, help="absolute slack (ms or MB)")
+    ap.add_argument("--save-baseline", action="store_true")
+    args = ap.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        excel, template = write_inputs(tmp, args.rows)
+        for reader in args.readers:
+            r = results[reader] = bench_reader(reader, excel, template, args.repeat)
+            print(f"{reader:<9} import {r['import_ms']:6.0f} ms {r['import_rss_mb']:6.1f} MB"
+                  f"   first request {r['first_request_ms']:6.0f} ms {r['request_rss_mb']:6.1f} MB"
+                  f"   loaded: {', '.join(r['loaded'])}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f: json.dump(results, f, indent=1, sort_keys=True)
+        print(f"baseline saved: {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print("no baseline to compare against (run with --save-baseline)")
+        return
+    with open(args.baseline) as f: baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance, args.slack)
+    for line in regressions: print("REGRESSION", line)
+    if regressions: sys.exit(1)
+    print("no regressions against baseline")
+
+if __name__ == "__main__":
+    main()
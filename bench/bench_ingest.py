@@ -0,0 +1,59 @@
+# Benchmark: input ingestion (read + parse to the deck data) per format.
+#   python bench/bench_ingest.py [rows ...]
+# One synthetic workbook per size, exported to each columnar format from its own frames;
+# every format must parse to the xlsx data. Parquet/Arrow are skipped without pyarrow.
+import os, sys, math, time, tempfile, statistics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "api"))
+import frame_parser, lean_reader, columnar_inputs
+from synth import write_workbook, write_columnar, COLUMNAR_FORMATS
+
+# input label -> (reader, columnar format or None for the workbook itself)
+INPUTS = {"xlsx/pandas": (frame_parser, None), "xlsx/openpyxl": (lean_reader, None)}
+INPUTS.update({fmt: (columnar_inputs, fmt) for fmt in COLUMNAR_FORMATS})
+
+def ingest(reader, src):
+    sheets = {name: table for name, table, _ in reader.iter_sheets(src) if table is not None}
+    return reader.parse_inputs(sheets)
+
+def comparable(data):
+    def norm(x):
+        if isinstance(x, float) and math.isnan(x): return "nan"
+        if isinstance(x, (list, tuple)): return [norm(v) for v in x]
+        return x
+    return {k: norm(v) for k, v in data.items() if k not in ("read_times", "ai_ticket")}
+
+def median_ms(fn, repeat=5):
+    fn()
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); runs.append(time.perf_counter() - t0)
+    return statistics.median(runs) * 1000
+
+def has_pyarrow():
+    try:
+        import pyarrow
+        return True
+    except ImportError:
+        return False
+
+def main(sizes):
+    skip = set() if has_pyarrow() else {"parquet", "arrow"}
+    if skip: print("pyarrow not installed: skipping parquet, arrow")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            excel = write_workbook(os.path.join(tmp, f"{rows}.xlsx"), rows)
+            expected = comparable(ingest(frame_parser, excel))
+            line = f"{rows:>6} rows/table"
+            for label, (reader, fmt) in INPUTS.items():
+                if fmt in skip: continue
+                src = excel if fmt is None else write_columnar(
+                    excel, os.path.join(tmp, f"{rows}.{fmt}.{'json' if fmt == 'json' else 'zip'}"), fmt)
+                assert comparable(ingest(reader, src)) == expected, f"{label} parses differently at {rows} rows"
+                ms = median_ms(lambda: ingest(reader, src))
+                line += f"  {label} {ms:7.1f} ms ({os.path.getsize(src) / 1024:.0f} KB)"
+            print(line)
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [5, 500, 5000])
@@ -0,0 +1,63 @@
+# Benchmark: partial save (untouched template entries copied raw) vs Presentation.save().
+#   python bench/bench_partial_save.py [image_mb ...]
+# Builds an image-heavy synthetic template per size, generates the deck, and times both
+# save paths with their peak Python allocations; the two packages must hold the same parts.
+# Each size also runs on a copy of the template whose first two slides are listed out of
+# part-name order, which python-pptx renames on load: untouched slides must still match.
+import os, re, sys, time, zipfile, tempfile, tracemalloc
+
+os.environ.setdefault("AI_PROVIDER", "off")
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "api"))
+from generate_poc import load_inputs, build_deck, TOUCHED_SLIDES
+from partial_save import save_partial, dirty_parts
+from synth import write_inputs
+
+# chart workbooks embed their creation time, so they differ between any two saves
+VOLATILE = ("ppt/embeddings/",)
+
+def timed_save(save, path):
+    # saved to a file so the peak reflects the save itself, not an in-memory output buffer
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    save(path)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, path
+
+def same_parts(a, b):
+    za, zb = zipfile.ZipFile(a), zipfile.ZipFile(b)
+    if za.namelist() != zb.namelist(): return False
+    return all(za.read(n) == zb.read(n) for n in za.namelist() if not n.startswith(VOLATILE))
+
+def reorder_slides(src, dst):
+    # swaps the first two <p:sldId> entries of presentation.xml; parts keep their names
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, "w", zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            data = zin.read(info.filename)
+            if info.filename == "ppt/presentation.xml":
+                xml = data.decode("utf-8")
+                first, second = re.findall(r"<p:sldId [^>]*/>", xml)[:2]
+                xml = xml.replace(first, "\0").replace(second, first).replace("\0", second)
+                data = xml.encode("utf-8")
+            zout.writestr(info, data)
+    return dst
+
+def main(sizes):
+    with tempfile.TemporaryDirectory() as tmp:
+        for image_mb in sizes:
+            excel, template = write_inputs(os.path.join(tmp, str(image_mb)), 50, 60, image_mb)
+            reordered = reorder_slides(template, os.path.join(tmp, str(image_mb), "reordered.pptx"))
+            for label, tpl in (("in order", template), ("reordered", reordered)):
+                ppt = build_deck(load_inputs(excel), tpl, use_ai=False)
+                t_full, m_full, full = timed_save(ppt.save, os.path.join(tmp, "full.pptx"))
+                t_part, m_part, part = timed_save(lambda out: save_partial(ppt, tpl, out, dirty_parts(ppt, TOUCHED_SLIDES)),
+                                                  os.path.join(tmp, "partial.pptx"))
+                assert same_parts(full, part), f"packages differ at {image_mb} MB ({label})"
+                mb = 1024 * 1024
+                print(f"{image_mb:>6} MB images {label:>9}  full {t_full * 1000:8.1f} ms {m_full / mb:7.1f} MB peak"
+                      f"   partial {t_part * 1000:7.1f} ms {m_part / mb:6.1f} MB peak   x{t_full / t_part:5.1f}")
+
+if __name__ == "__main__":
+    main([float(a) for a in sys.argv[1:]] or [0, 10, 50])
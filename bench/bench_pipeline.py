@@ -0,0 +1,138 @@
+# Benchmark: the whole pipeline on synthetic inputs, stage by stage, plus HTTP throughput.
+#   python bench/bench_pipeline.py [--rows 5 50 500] [--slides 34 120] [--save-baseline]
+# Each scenario (rows per breakup sheet x template slides) is run --repeat times after a
+# warm-up; the median per stage is compared with bench/baseline.json and the run exits 1
+# when a stage is slower than baseline * (1 + tolerance) + slack (or HTTP req/s drops by
+# the same factor). Baselines are machine specific: re-record with --save-baseline.
+import os, sys, io, json, time, argparse, tempfile, statistics, threading
+
+# no network calls and no result cache: every request must do the full work
+os.environ.setdefault("AI_PROVIDER", "off")
+os.environ.setdefault("RESULT_CACHE_MAX_BYTES", "0")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "api"))
+from template_cache import checkout_template
+from generate_poc import (workbook_reader, plan_for, fill_slide34_text, replace_forecast_chart,
+                          fill_slide33, fill_paragraph, save_deck)
+from synth import write_inputs
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+READER = workbook_reader()   # WORKBOOK_READER=openpyxl benchmarks the lean reader
+STAGES = ("load", "parse", "template", "text", "chart", "layout", "paragraph", "save")
+
+def checkout_with_plan(template):
+    ppt, template_key = checkout_template(template)
+    return ppt, plan_for(ppt, template_key)
+
+def run_once(excel, template):
+    times = {}
+    def stage(name, fn, *args):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        times[name] = time.perf_counter() - t0
+        return result
+    sheets = stage("load", lambda: {n: f for n, f, _ in READER.iter_sheets(excel) if f is not None})
+    data   = stage("parse", READER.parse_inputs, sheets)
+    ppt, plan = stage("template", checkout_with_plan, template)
+    stage("text", fill_slide34_text, ppt, data, plan)
+    stage("chart", replace_forecast_chart, ppt, data, plan)
+    stage("layout", fill_slide33, ppt, data, plan)
+    stage("paragraph", fill_paragraph, ppt, data, plan)
+    stage("save", save_deck, ppt, io.BytesIO(), template)
+    return times
+
+def bench_stages(excel, template, repeat):
+    run_once(excel, template)   # warm-up: template cache and plan
+    runs = [run_once(excel, template) for _ in range(repeat)]
+    return {s: statistics.median(r[s] for r in runs) * 1000 for s in STAGES}
+
+def bench_http(excel, template, requests, concurrency):
+    import index
+    with open(excel, "rb") as f: excel_bytes = f.read()
+    with open(template, "rb") as f: template_bytes = f.read()
+    latencies, failures, lock = [], [], threading.Lock()
+    todo = iter(range(requests))
+
+    def client():
+        c = index.app.test_client()
+        while True:
+            with lock:
+                if next(todo, None) is None: return
+            t0 = time.perf_counter()
+            r = c.post("/", data={"excel": (io.BytesIO(excel_bytes), "datasheet_imarc.xlsx"),
+                                  "template": (io.BytesIO(template_bytes), "template.pptx")},
+                       content_type="multipart/form-data")
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+                if r.status_code != 200: failures.append(r.status_code)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    wall = time.perf_counter() - t0
+    if failures: raise SystemExit(f"HTTP benchmark: {len(failures)} failed requests {failures[:5]}")
+    latencies.sort()
+    return {"req_per_s": requests / wall,
+            "p50_ms": latencies[len(latencies) // 2] * 1000,
+            "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000}
+
+def compare(results, baseline, tolerance, slack_ms):
+    regressions = []
+    for scenario, stages in results["stages"].items():
+        base = baseline.get("stages", {}).get(scenario, {})
+        for s, ms in stages.items():
+            if s in base and ms > base[s] * (1 + tolerance) + slack_ms:
+                regressions.append(f"{scenario} {s}: {ms:.1f} ms vs baseline {base[s]:.1f} ms")
+    for scenario, h in results["http"].items():
+        base = baseline.get("http", {}).get(scenario)
+        if base and h["req_per_s"] < base["req_per_s"] / (1 + tolerance):
+            regressions.append(f"{scenario} http: {h['req_per_s']:.2f} req/s vs baseline {base['req_per_s']:.2f}")
+    return regressions
+
+def main():
+    ap = argparse.ArgumentParser(description="Stage timings and HTTP throughput on synthetic inputs")
+    ap.add_argument("--rows", type=int, nargs="+", default=[5, 50, 500], help="body rows per breakup sheet")
+    ap.add_argument("--slides", type=int, nargs="+", default=[34, 120], help="template slide counts")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--http-rows", type=int, default=50, help="rows for the HTTP scenario (0 to skip)")
+    ap.add_argument("--requests", type=int, default=20)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--baseline", default=BASELINE_PATH)
+    ap.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown as a fraction")
+    ap.add_argument("--slack-ms", type=float, default=10.0, help="absolute slack for very short stages")
+    ap.add_argument("--save-baseline", action="store_true")
+    args = ap.parse_args()
+
+    results = {"stages": {}, "http": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            for slides in args.slides:
+                scenario = f"rows={rows},slides={slides}"
+                excel, template = write_inputs(os.path.join(tmp, scenario), rows, slides)
+                stages = results["stages"][scenario] = bench_stages(excel, template, args.repeat)
+                print(f"{scenario:<22}" + "".join(f" {s} {ms:7.1f}" for s, ms in stages.items())
+                      + f"  total {sum(stages.values()):7.1f} ms")
+        if args.http_rows:
+            scenario = f"rows={args.http_rows},slides={args.slides[0]}"
+            excel, template = write_inputs(os.path.join(tmp, "http"), args.http_rows, args.slides[0])
+            h = results["http"][scenario] = bench_http(excel, template, args.requests, args.concurrency)
+            print(f"{scenario:<22} http x{args.concurrency}: {h['req_per_s']:.2f} req/s"
+                  f"  p50 {h['p50_ms']:.0f} ms  p95 {h['p95_ms']:.0f} ms")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f: json.dump(results, f, indent=1, sort_keys=True)
+        print(f"baseline saved: {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print("no baseline to compare against (run with --save-baseline)")
+        return
+    with open(args.baseline) as f: baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance, args.slack_ms)
+    for line in regressions: print("REGRESSION", line)
+    if regressions: sys.exit(1)
+    print("no regressions against baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# Benchmark: preflight validation vs the full read + parse it stands in front of.
+#   python bench/bench_preflight.py [rows ...]
+# The preflight stops at the first rows that satisfy each check, so its cost should stay
+# near the workbook open time while read + parse grows with the breakup tables.
+import os, sys, time, tempfile, statistics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "api"))
+from preflight import validate_workbook
+from generate_poc import load_inputs
+from synth import write_workbook
+
+def median_ms(fn, repeat=5):
+    fn()
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); runs.append(time.perf_counter() - t0)
+    return statistics.median(runs) * 1000
+
+def main(sizes):
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            excel = write_workbook(os.path.join(tmp, f"{rows}.xlsx"), rows)
+            assert validate_workbook(excel) == []
+            t_pre = median_ms(lambda: validate_workbook(excel))
+            t_full = median_ms(lambda: load_inputs(excel))
+            print(f"{rows:>6} rows/table  preflight {t_pre:7.1f} ms  read+parse {t_full:8.1f} ms  x{t_full / t_pre:5.1f}")
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [5, 500, 5000])
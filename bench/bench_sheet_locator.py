@@ -0,0 +1,76 @@
+# Benchmark: vectorized breakup-table locator vs the original row-by-row scan.
+#   python bench/bench_sheet_locator.py [rows ...]
+# Sheets stack a volume table, the sales value table and a share table, each `rows` tall,
+# so the locator has to skip a whole table before and stop before the next one.
+import os, sys, timeit
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+from frame_parser import sales_value_table_from_raw, series_from_sheet
+
+YEARS = list(range(2019, 2034))
+
+def sales_value_table_rowwise(raw, sheet_name):
+    # the pre-vectorization implementation (without its 80-row title limit), kept as the reference
+    title_idx = None
+    for i in range(len(raw)):
+        cell0 = str(raw.iloc[i, 0]).strip() if pd.notna(raw.iloc[i, 0]) else ""
+        if ("market breakup" in cell0.lower()) and ("sales value" in cell0.lower()):
+            title_idx = i; break
+    header_idx = title_idx + 1
+    header = [str(x).strip() for x in raw.iloc[header_idx].tolist()]
+    data_rows = []
+    for r in range(header_idx + 1, len(raw)):
+        first_text = str(raw.iloc[r, 0]).strip() if pd.notna(raw.iloc[r, 0]) else ""
+        if first_text.lower().startswith("market breakup"): break
+        if first_text == "" and len(data_rows) > 0: break
+        data_rows.append(raw.iloc[r].tolist())
+        if first_text.lower() == "total": break
+    df = pd.DataFrame(data_rows, columns=header)
+    name_col = df.columns[0]
+    def pick_year(columns, year):
+        for c in columns:
+            if str(c).strip() == str(year): return c
+        for c in columns:
+            try:
+                if float(str(c)) == float(year): return c
+            except Exception: pass
+        return None
+    col24 = pick_year(df.columns, 2024); col33 = pick_year(df.columns, 2033)
+    bad = {"total", "type", "source", "region", ""}
+    mask = df[name_col].astype(str).str.strip().str.lower()
+    df = df[~mask.isin(bad)]
+    df = df[[name_col, col24, col33]].copy()
+    df[col24] = pd.to_numeric(df[col24], errors="coerce")
+    df[col33] = pd.to_numeric(df[col33], errors="coerce")
+    df = df.dropna(subset=[col24, col33])
+    return df.rename(columns={col24: 2024, col33: 2033})
+
+def stacked_sheet(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for kind in ("Sales Volume", "Sales Value (Million US$)", "Market Share (%)"):
+        rows.append([f"Market Breakup by Type - {kind}"] + [None] * len(YEARS))
+        rows.append(["Type"] + YEARS)
+        for i in range(n_rows):
+            vals = [float(v) for v in rng.uniform(-5, 500, len(YEARS))]
+            if i % 11 == 3: vals[5] = None               # blank 2024
+            rows.append([f" Segment {i} " if i % 13 else None] + vals)
+        rows.append(["Total"] + [9999.0] * len(YEARS))
+        rows.append([None] * (len(YEARS) + 1))
+    return pd.DataFrame(rows)
+
+def main(sizes):
+    for n in sizes:
+        raw = stacked_sheet(n)
+        new = sales_value_table_from_raw(raw, "By_Type")
+        old = sales_value_table_rowwise(raw, "By_Type")
+        assert series_from_sheet(new) == series_from_sheet(old), f"output mismatch at {n} rows"
+        reps = max(1, 2000 // n)
+        t_new = timeit.timeit(lambda: sales_value_table_from_raw(raw, "By_Type"), number=reps) / reps
+        t_old = timeit.timeit(lambda: sales_value_table_rowwise(raw, "By_Type"), number=reps) / reps
+        print(f"{n:>7} rows/table  vectorized {t_new * 1000:8.2f} ms  row-wise {t_old * 1000:9.2f} ms  x{t_old / t_new:6.1f}")
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10, 100, 1000, 10000])
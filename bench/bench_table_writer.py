@@ -0,0 +1,56 @@
+# Benchmark: bulk table writer vs the original cell-by-cell fill + style_table_basic.
+#   python bench/bench_table_writer.py [rows ...]
+import os, sys, time
+from copy import deepcopy
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Inches
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+from generate_poc import fill_table_body, rows_with_unit, style_table_basic
+
+def fill_table_body_cellwise(T, rows, unit_label):
+    # the pre-bulk implementation, kept as the reference
+    rows = rows_with_unit(rows, unit_label)
+    have = len(T.rows) - 1
+    last_tr = T._tbl.tr_lst[-1]
+    for _ in range(max(0, len(rows) - have)): T._tbl.append(deepcopy(last_tr))
+    for r_idx, row_vals in enumerate(rows, start=1):
+        for c_idx, val in enumerate(row_vals[:len(T.columns)]):
+            T.cell(r_idx, c_idx).text = str(val)
+    style_table_basic(T)
+
+def blank_table(n_body=1):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    gf = slide.shapes.add_table(1 + n_body, 5, Inches(0.5), Inches(0.5), Inches(7), Inches(0.5))
+    for c, h in enumerate(["Breakup by Type", "Unit", "2024", "2033", "CAGR"]): gf.table.cell(0, c).text = h
+    return gf
+
+def sample_rows(n):
+    rows = [(f"Segment {i}", f"{i * 1.5:,.1f}", f"{i * 2.25:,.1f}", f"{(i % 9) + 0.5:.1f}%") for i in range(n)]
+    if n > 3:   # awkward text that must still match the python-pptx output
+        rows[1] = ("Two\nparagraphs", "", "1\vsoft break", "\x07bell")
+    return rows
+
+def run(fill, n):
+    gf = blank_table()
+    t0 = time.perf_counter()
+    fill(gf.table, sample_rows(n), "Million US$")
+    return time.perf_counter() - t0, etree.tostring(gf._element)
+
+# the reference path is quadratic in rows; above this it is skipped
+REF_MAX_ROWS = 300
+
+def main(sizes):
+    for n in sizes:
+        t_new, xml_new = run(fill_table_body, n)
+        line = f"{n:>6} rows  bulk {t_new * 1000:8.1f} ms ({t_new / n * 1e6:6.1f} us/row)"
+        if n <= REF_MAX_ROWS:
+            t_old, xml_old = run(fill_table_body_cellwise, n)
+            assert xml_old == xml_new, f"table XML differs at {n} rows"
+            line += f"  cell-by-cell {t_old * 1000:9.1f} ms  x{t_old / t_new:6.1f}"
+        print(line)
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10, 50, 100, 300, 1000, 5000])
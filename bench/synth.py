@@ -0,0 +1,138 @@
+# Synthetic inputs for the benchmarks: a datasheet_imarc.xlsx-shaped workbook and a template
+# with the slide 33 tables / slide 34 text+chart the engine fills.
+#   python bench/synth.py OUT_DIR [rows] [slides] [image_mb]
+import io, os, sys, json, random, zipfile
+import pandas as pd
+from pptx import Presentation
+from pptx.util import Inches
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+
+YEARS = list(range(2019, 2034))
+BREAKUPS = (("By_Type", "Type"), ("By_Source", "Source"), ("By_Region", "Region"))
+MIN_SLIDES = 34   # the engine fills slides 33 and 34
+
+def breakup_sheet(label, n_rows, rnd):
+    # volume block first, then the value block read_sales_value_table looks for
+    width = len(YEARS) + 1
+    rows = [[f"Market Breakup by {label} - Sales Volume"] + [None] * len(YEARS), [label] + YEARS]
+    rows += [[f"{label} volume {i}"] + [1] * len(YEARS) for i in range(3)]
+    rows.append([None] * width)
+    rows.append([f"Market Breakup by {label} - Sales Value (Million US$)"] + [None] * len(YEARS))
+    rows.append([label] + YEARS)
+    for i in range(n_rows):
+        # every 7th row is blank/zero, like real sheets with discontinued segments
+        vals = [round(rnd.uniform(-5, 500), 3) if i % 7 else (0 if i else None) for _ in YEARS]
+        rows.append([f"{label} {i}"] + vals)
+    rows.append(["Total"] + [9999] * len(YEARS))
+    return pd.DataFrame(rows)
+
+def _write_market(xw, prefix, market, counts, rnd, base_year):
+    pd.DataFrame({"Value": [market, "Million US$"]}, index=["Market Name", "Units"]).to_excel(xw, sheet_name=prefix + "Summary")
+    pd.DataFrame({"Year": YEARS,
+                  "Sales Value (Million USD)": [1000 * 1.05 ** i for i in range(len(YEARS))],
+                  f"CAGR 2019–{base_year} (%)": [5.0] * len(YEARS)}).to_excel(xw, sheet_name=prefix + "Sales_Forecast", index=False)
+    for sheet, label in BREAKUPS:
+        breakup_sheet(label, counts[sheet], rnd).to_excel(xw, sheet_name=prefix + sheet, header=False, index=False)
+
+def write_workbook(path, rows=5, market="Food Colors", seed=1, markets=0, base_year=2024):
+    # rows: int (same for every breakup) or {"By_Type": n, ...}; base_year names the CAGR column
+    # markets > 0 writes a consolidated workbook: sheet blocks "M1_Summary", "M2_Summary", ...
+    rnd = random.Random(seed)
+    counts = rows if isinstance(rows, dict) else {sheet: rows for sheet, _ in BREAKUPS}
+    with pd.ExcelWriter(path, engine="openpyxl") as xw:
+        if not markets:
+            _write_market(xw, "", market, counts, rnd, base_year)
+        for m in range(1, markets + 1):
+            _write_market(xw, f"M{m}_", f"{market} {m}", counts, rnd, base_year)
+    return path
+
+# ---------- COLUMNAR INPUTS ----------
+# The same logical inputs as a workbook, as columnar_inputs.py takes them: one JSON document
+# or a zip bundle of per-table CSV / Parquet / Arrow files (the last two need pyarrow).
+COLUMNAR_FORMATS = ("json", "csv", "parquet", "arrow")
+
+def workbook_tables(excel):
+    # {table: DataFrame} read from a workbook; breakups as their located sales value tables
+    from workbook import load_sheets
+    from frame_parser import sales_value_table_from_raw
+    frames, _ = load_sheets(excel)
+    tables = {"Summary": frames.pop("Summary").rename_axis("Field").reset_index(),
+              "Sales_Forecast": frames.pop("Sales_Forecast")}
+    for name, raw in frames.items():
+        try: table = sales_value_table_from_raw(raw, name)
+        except ValueError: continue   # extra By_* sheets without a value table, as parse_inputs skips them
+        table.columns = [str(c) for c in table.columns]
+        tables[name] = table.reset_index(drop=True)
+    return tables
+
+def write_columnar(excel, path, fmt):
+    tables = workbook_tables(excel)
+    if fmt == "json":
+        with open(path, "w") as f:
+            json.dump({name: t.to_dict(orient="list") for name, t in tables.items()}, f)
+        return path
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, t in tables.items():
+            buf = io.BytesIO()
+            if fmt == "csv": buf.write(t.to_csv(index=False).encode())
+            elif fmt == "parquet": t.to_parquet(buf, index=False)
+            else: t.to_feather(buf)
+            z.writestr(f"{name}.{'arrow' if fmt == 'arrow' else fmt}", buf.getvalue())
+    return path
+
+def _table(slide, top_in, header):
+    gf = slide.shapes.add_table(2, 5, Inches(0.5), Inches(top_in), Inches(7), Inches(0.5))
+    for c, h in enumerate(header): gf.table.cell(0, c).text = h
+    return gf
+
+def _text(slide, left_in, top_in, width_in, height_in, text):
+    slide.shapes.add_textbox(Inches(left_in), Inches(top_in), Inches(width_in), Inches(height_in)).text = text
+
+def noise_png(n_bytes, seed):
+    # incompressible picture of roughly n_bytes (stands in for photos in real templates)
+    from PIL import Image
+    side = max(8, int((n_bytes / 3) ** 0.5))
+    buf = io.BytesIO()
+    Image.frombytes("RGB", (side, side), random.Random(seed).randbytes(side * side * 3)).save(buf, "PNG", compress_level=0)
+    buf.seek(0)
+    return buf
+
+def write_template(path, slides=MIN_SLIDES, image_mb=0):
+    # image_mb: total size of pictures spread over the slides the engine does not touch
+    ppt = Presentation()
+    blank = ppt.slide_layouts[6]
+    n_slides = max(slides, MIN_SLIDES)
+    picture_bytes = int(image_mb * 1024 * 1024 / (n_slides - 2)) if image_mb else 0
+    for i in range(n_slides):
+        s = ppt.slides.add_slide(blank)
+        if picture_bytes and i not in (32, 33):
+            s.shapes.add_picture(noise_png(picture_bytes, i), Inches(5), Inches(3), Inches(3))
+        if i == 32:
+            _text(s, 0.5, 0.1, 6, 0.3, "Food Flavors Market Overview")
+            _table(s, 0.4, ["Particulars", "Unit", "2024", "2033", "CAGR"])
+            for top, label in ((1.2, "Type"), (3.6, "Form"), (5.6, "Region")):
+                _text(s, 0.5, top, 6, 0.3, f"Breakup by {label}")
+                _table(s, top + 0.3, [f"Breakup by {label}", "Unit", "2024", "2033", "CAGR"])
+        elif i == 33:
+            _text(s, 0.5, 0.2, 8, 0.4, "Global Food Flavors Market")
+            _text(s, 0.5, 0.7, 8, 0.6, "The global food flavors market reached X.")
+            _text(s, 0.5, 1.4, 8, 0.6, "Additionally, advancements in...")
+            cd = CategoryChartData(); cd.categories = ["a", "b"]; cd.add_series("s", (1, 2))
+            s.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, Inches(0.5), Inches(2.2), Inches(6), Inches(4), cd)
+        else:
+            _text(s, 1, 1, 4, 1, f"Slide {i + 1}")
+    ppt.save(path)
+    return path
+
+def write_inputs(out_dir, rows=5, slides=MIN_SLIDES, image_mb=0):
+    os.makedirs(out_dir, exist_ok=True)
+    return (write_workbook(os.path.join(out_dir, "datasheet_imarc.xlsx"), rows),
+            write_template(os.path.join(out_dir, "template.pptx"), slides, image_mb))
+
+if __name__ == "__main__":
+    out_dir = sys.argv[1]
+    rows    = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    slides  = int(sys.argv[3]) if len(sys.argv) > 3 else MIN_SLIDES
+    image_mb = float(sys.argv[4]) if len(sys.argv) > 4 else 0
+    for p in write_inputs(out_dir, rows, slides, image_mb): print(p)
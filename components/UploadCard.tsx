@@ -1,11 +1,66 @@
 "use client";
 import React, { useState } from "react";
 
+type Job = {
+  id: string;
+  status: "queued" | "running" | "done" | "failed";
+  stage: string;
+  progress: number;
+  error: string | null;
+  status_url: string;
+  download_url?: string;
+};
+
+type Problem = { sheet: string | null; code: string; message: string };
+type Validation = { ok: boolean; errors: Problem[]; ms?: number };
+
+// The async job flow (submit, poll, download) only works when every request can reach the
+// shared job store, so it is opt-in: NEXT_PUBLIC_ASYNC_JOBS=1 with ASYNC_JOBS=1 and
+// JOB_BACKEND=sqlite on the server. By default the deck comes back from a single POST.
+const ASYNC_JOBS = process.env.NEXT_PUBLIC_ASYNC_JOBS === "1";
+const POLL_MS = 1000;
+const sleep = (ms: number) => new Promise((r) => setTimeout(r, ms));
+
+// 422 responses carry the workbook problems found by the preflight check
+const problemText = (v: Validation) => v.errors.map((p) => p.message).join("\n");
+
+async function responseError(res: Response, fallback: string) {
+  if (res.status === 422) return problemText(await res.json());
+  return (await res.text()) || fallback;
+}
+
+async function generateDirect(form: FormData): Promise<Blob> {
+  const res = await fetch("/api", { method: "POST", body: form });
+  if (!res.ok) throw new Error(await responseError(res, "Server error"));
+  return res.blob();
+}
+
+// queue the job, then poll its status instead of holding one long request open
+async function generateViaJob(form: FormData, setStage: (s: string) => void): Promise<Blob> {
+  const res = await fetch("/api/jobs", { method: "POST", body: form });
+  if (!res.ok) throw new Error(await responseError(res, "Server error"));
+  let job: Job = await res.json();
+  while (job.status === "queued" || job.status === "running") {
+    setStage(job.status === "queued" ? "Waiting in queue…" : `Generating (${job.stage}, ${job.progress}%)…`);
+    await sleep(POLL_MS);
+    const poll = await fetch(job.status_url);
+    if (!poll.ok) throw new Error((await poll.text()) || "Lost track of the job");
+    job = await poll.json();
+  }
+  if (job.status === "failed" || !job.download_url) {
+    throw new Error(job.error || "Generation failed");
+  }
+  const dl = await fetch(job.download_url);
+  if (!dl.ok) throw new Error((await dl.text()) || "Download failed");
+  return dl.blob();
+}
+
 export default function UploadCard() {
   const [excel, setExcel] = useState<File | null>(null);
   const [ppt, setPpt] = useState<File | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [stage, setStage] = useState<string | null>(null);
 
   const onSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
@@ -14,18 +69,15 @@ export default function UploadCard() {
       setError("Please select the Excel file.");
       return;
     }
-    const form = new FormData();
-    form.append("excel", excel);
-    if (ppt) form.append("template", ppt); // optional
-
     setLoading(true);
     try {
-      const res = await fetch("/api", { method: "POST", body: form });
-      if (!res.ok) {
-        const msg = await res.text();
-        throw new Error(msg || "Server error");
-      }
-      const blob = await res.blob();
+      // the server preflights the workbook itself and answers a bad one with 422 + problems
+      const form = new FormData();
+      form.append("excel", excel);
+      if (ppt) form.append("template", ppt); // optional
+
+      setStage(ASYNC_JOBS ? "Uploading…" : "Generating…");
+      const blob = ASYNC_JOBS ? await generateViaJob(form, setStage) : await generateDirect(form);
       const url = window.URL.createObjectURL(blob);
       const a = document.createElement("a");
       a.href = url; a.download = "updated_poc.pptx";
@@ -35,6 +87,7 @@ export default function UploadCard() {
       setError(err.message || "Something went wrong");
     } finally {
       setLoading(false);
+      setStage(null);
     }
   };
 
@@ -42,10 +95,10 @@ export default function UploadCard() {
     <form onSubmit={onSubmit} className="bg-white shadow-soft rounded-2xl p-6">
       <div className="grid gap-4">
         <div>
-          <label className="block text-sm font-medium mb-1">Excel file</label>
+          <label className="block text-sm font-medium mb-1">Excel file <span className="text-neutral-500">(or JSON / table bundle)</span></label>
           <input
             type="file"
-            accept=".xls,.xlsx"
+            accept=".xls,.xlsx,.json,.zip"
             onChange={(e) => setExcel(e.target.files?.[0] || null)}
             className="w-full file:mr-4 file:py-2 file:px-4 file:rounded-xl file:border-0 file:bg-neutral-900 file:text-white file:text-sm file:cursor-pointer border rounded-xl p-1"
           />
@@ -61,14 +114,14 @@ export default function UploadCard() {
         </div>
       </div>
 
-      {error && <p className="text-sm text-red-600 mt-3">{error}</p>}
+      {error && <p className="text-sm text-red-600 mt-3 whitespace-pre-line">{error}</p>}
 
       <button
         type="submit"
         className="mt-5 w-full rounded-2xl px-4 py-3 text-sm font-medium bg-neutral-900 text-white disabled:opacity-60"
         disabled={loading}
       >
-        {loading ? "Generating…" : "Generate PPTX"}
+        {loading ? stage || "Generating…" : "Generate PPTX"}
       </button>
 
       <p className="mt-3 text-xs text-neutral-500">